@@ -5,8 +5,9 @@ Designs workflow architecture based on requirements and patterns
 
 import json
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
+import httpx
 from langchain.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 
@@ -103,8 +104,8 @@ Return your architecture design as valid JSON:
   "reasoning": "Detailed explanation of why this architecture was chosen and how it meets requirements"
 }}"""
 
-    def __init__(self):
-        super().__init__(name="Architecture Agent")
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        super().__init__(name="Architecture Agent", http_client=http_client)
 
     async def execute(self, state: WorkflowGenerationState) -> Dict[str, Any]:
         """
@@ -3,9 +3,10 @@ Base Agent Class for Multi-Agent Workflow Generation
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, TYPE_CHECKING
+from typing import Dict, Any, Optional, TYPE_CHECKING
 import logging
 
+import httpx
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 
@@ -25,16 +26,23 @@ class BaseAgent(ABC):
     Each agent is responsible for one stage of the workflow generation process.
     """
 
-    def __init__(self, name: str, llm: ChatOpenAI = None):
+    def __init__(
+        self,
+        name: str,
+        llm: ChatOpenAI = None,
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
         """
         Initialize the agent.
 
         Args:
             name: Agent name for logging
             llm: Language model (defaults to llm_service)
+            http_client: Shared HTTP client for LLM calls (reuses pooled connections)
         """
         self.name = name
         self.llm = llm
+        self.http_client = http_client
         logger.info(f"✅ Initialized {self.name}")
 
     async def ensure_llm(self) -> ChatOpenAI:
@@ -52,7 +60,8 @@ class BaseAgent(ABC):
             model=settings.openai_model,
             api_key=settings.openai_api_key,
             base_url=settings.openai_base_url,
-            temperature=0.7
+            temperature=0.7,
+            http_async_client=self.http_client
         )
         return self.llm
 
@@ -5,8 +5,9 @@ Configures individual nodes with proper data and connections
 
 import json
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
+import httpx
 from langchain.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 
@@ -82,8 +83,8 @@ IMPORTANT Edge Rules:
   - sourceHandle: "false" for false branch
 - All other edges should only have: id, source, target"""
 
-    def __init__(self):
-        super().__init__(name="Configuration Agent")
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        super().__init__(name="Configuration Agent", http_client=http_client)
 
     async def execute(self, state: WorkflowGenerationState) -> Dict[str, Any]:
         """
@@ -5,8 +5,9 @@ Validates and scores workflow quality
 
 import json
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
+import httpx
 from langchain.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 
@@ -139,8 +140,8 @@ Return assessment as valid JSON:
 - severity must be: "high", "medium", or "low"
 - Set should_retry=true only if overall_score < 70 and issues can be fixed by reconfiguration"""
 
-    def __init__(self):
-        super().__init__(name="Quality Assurance Agent")
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        super().__init__(name="Quality Assurance Agent", http_client=http_client)
 
     async def execute(self, state: WorkflowGenerationState) -> Dict[str, Any]:
         """
@@ -5,8 +5,9 @@ Transforms vague user input into structured requirements
 
 import json
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
+import httpx
 from langchain.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import JsonOutputParser
 
@@ -101,8 +102,8 @@ Return your analysis as valid JSON matching this schema:
   "confidence_score": 0.85
 }}"""
 
-    def __init__(self):
-        super().__init__(name="Requirements Agent")
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        super().__init__(name="Requirements Agent", http_client=http_client)
 
     async def execute(self, state: WorkflowGenerationState) -> Dict[str, Any]:
         """
@@ -26,7 +26,7 @@ async def validate_dify_dsl(dsl: Dict[str, Any]) -> Dict[str, Any]:
     """
     try:
         # Validate with Pydantic
-        validated_dsl = DifyDSL(**dsl)
+        validated_dsl = DifyDSL.model_validate(dsl)
 
         # Get statistics
         nodes = validated_dsl.workflow.graph.nodes if validated_dsl.workflow else []
@@ -85,7 +85,7 @@ async def convert_to_dify(custom_dsl: Dict[str, Any]) -> Dict[str, Any]:
         dify_dsl = converter.convert_to_dify(custom_dsl)
 
         # Validate the result
-        validated_dsl = DifyDSL(**dify_dsl)
+        validated_dsl = DifyDSL.model_validate(dify_dsl)
 
         conversion_time = time.time() - start_time
 
@@ -122,7 +122,7 @@ async def import_dify_dsl(dsl: Dict[str, Any]) -> Dict[str, Any]:
     """
     try:
         # Validate with Pydantic
-        validated_dsl = DifyDSL(**dsl)
+        validated_dsl = DifyDSL.model_validate(dsl)
 
         # Get statistics
         nodes = validated_dsl.workflow.graph.nodes if validated_dsl.workflow else []
@@ -76,33 +76,6 @@ async def search_patterns(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/{pattern_id}")
-async def get_pattern(pattern_id: str) -> Dict[str, Any]:
-    """Get a specific pattern by ID."""
-    try:
-        if not vector_store._initialized:
-            raise HTTPException(
-                status_code=503,
-                detail="Vector store not initialized"
-            )
-
-        pattern = await vector_store.get_pattern(pattern_id)
-
-        if not pattern:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Pattern '{pattern_id}' not found"
-            )
-
-        return pattern
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"❌ Failed to get pattern: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-
-
 @router.post("/add")
 async def add_pattern(pattern: WorkflowPattern) -> Dict[str, str]:
     """
@@ -223,4 +196,32 @@ async def get_pattern_statistics() -> Dict[str, Any]:
 
     except Exception as e:
         logger.error(f"❌ Failed to get statistics: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# Declared last so the catch-all path does not shadow /recommend and /statistics
+@router.get("/{pattern_id}")
+async def get_pattern(pattern_id: str) -> Dict[str, Any]:
+    """Get a specific pattern by ID."""
+    try:
+        if not vector_store._initialized:
+            raise HTTPException(
+                status_code=503,
+                detail="Vector store not initialized"
+            )
+
+        pattern = await vector_store.get_pattern(pattern_id)
+
+        if not pattern:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Pattern '{pattern_id}' not found"
+            )
+
+        return pattern
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Failed to get pattern: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -3,9 +3,13 @@ Application Configuration
 Uses pydantic-settings for environment variable management
 """
 
+from pathlib import Path
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import List
 
+# backend/ - anchors on-disk data independently of the working directory
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -21,6 +25,9 @@ class Settings(BaseSettings):
     openai_model: str = "gpt-4"
     openai_embedding_model: str = "text-embedding-3-small"
     openai_base_url: str = "https://api.openai.com/v1"
+    openai_max_concurrency: int = 8  # Upper bound for AIMD-limited concurrent completions
+    openai_rpm_limit: int = 0  # Requests per minute gate for completions (0 = disabled)
+    embedding_cache_path: str = str(BACKEND_DIR / "knowledge_base" / "embedding_cache.db")  # SQLite cache for pattern embeddings
 
     # ChromaDB Configuration
     chromadb_host: str = "localhost"
@@ -2,12 +2,13 @@
 LangGraph State Definition for Workflow Generation
 """
 
-from typing import TypedDict, Optional, List, Dict, Any
+from functools import cached_property
+from typing import TypedDict, Optional, List, Dict, Any, ClassVar, Tuple
 from pydantic import BaseModel
 
 
 class ClarifiedRequirements(BaseModel):
-    """Structured requirements from Requirements Agent."""
+    """Structured requirements from Requirements Agent (immutable once analyzed)."""
     business_intent: str
     input_data: Dict[str, Any]
     expected_output: Dict[str, Any]
@@ -17,6 +18,26 @@ class ClarifiedRequirements(BaseModel):
     constraints: List[str]
     confidence_score: float  # 0-1
 
+    model_config = {"frozen": True}
+
+    # Lower-cased views computed once per (immutable) instance
+    _CACHED_VIEWS: ClassVar[Tuple[str, ...]] = ("business_intent_lc", "constraints_lc")
+
+    @cached_property
+    def business_intent_lc(self) -> str:
+        return self.business_intent.lower()
+
+    @cached_property
+    def constraints_lc(self) -> Tuple[str, ...]:
+        return tuple(constraint.lower() for constraint in self.constraints)
+
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> "ClarifiedRequirements":
+        copied = super().model_copy(update=update, deep=deep)
+        # Copies share __dict__ contents; drop cached views so updated fields are re-derived
+        for name in self._CACHED_VIEWS:
+            copied.__dict__.pop(name, None)
+        return copied
+
 
 class WorkflowArchitecture(BaseModel):
     """Workflow architecture from Architecture Agent."""
@@ -6,7 +6,7 @@ Generates Dify workflow DSL from structured requirements
 from typing import Dict, Any, List, Optional
 import logging
 import yaml
-import json
+import orjson
 from datetime import datetime
 
 from app.models.workflow import WorkflowMetadata, NodeBase, EdgeBase
@@ -247,7 +247,10 @@ class DSLService:
         Returns:
             JSON string
         """
-        return json.dumps(workflow, indent=2)
+        # orjson emits UTF-8 directly instead of \u-escaping non-ASCII text
+        return orjson.dumps(
+            workflow, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode()
 
     def validate_workflow(self, workflow: Dict[str, Any]) -> tuple[bool, List[str]]:
         """
@@ -0,0 +1,136 @@
+"""
+Embedding Cache - SQLite persistence
+Reuses embedding vectors for unchanged text across runs
+"""
+
+import hashlib
+import logging
+import sqlite3
+from array import array
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Keep IN (...) lookups well below SQLite's bound-parameter limit
+_LOOKUP_CHUNK_SIZE = 500
+
+
+class EmbeddingCache:
+    """Content-addressed embedding cache keyed by (sha256, provider, model)."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        provider: str = "openai",
+        model: Optional[str] = None
+    ):
+        """
+        Initialize embedding cache.
+
+        Args:
+            path: SQLite database file (default: settings.embedding_cache_path)
+            provider: Embedding provider name
+            model: Embedding model name (default: settings.openai_embedding_model)
+        """
+        self.path = path or settings.embedding_cache_path
+        self.provider = provider
+        self.model = model or settings.openai_embedding_model
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Open the database on first use."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embedding_cache ("
+                "hash TEXT, provider TEXT, model TEXT, vector BLOB, "
+                "PRIMARY KEY (hash, provider, model))"
+            )
+        return self._conn
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """Hash text content for cache lookups."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Look up cached embeddings.
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            Embedding per text, or None where it is not cached
+        """
+        hashes = [self.content_hash(text) for text in texts]
+        found: Dict[str, List[float]] = {}
+
+        unique_hashes = list(dict.fromkeys(hashes))
+        for start in range(0, len(unique_hashes), _LOOKUP_CHUNK_SIZE):
+            chunk = unique_hashes[start:start + _LOOKUP_CHUNK_SIZE]
+            rows = self.conn.execute(
+                "SELECT hash, vector FROM embedding_cache "
+                f"WHERE provider = ? AND model = ? AND hash IN ({', '.join('?' * len(chunk))})",
+                (self.provider, self.model, *chunk)
+            )
+            for content_hash, blob in rows:
+                found[content_hash] = array("f", blob).tolist()
+
+        return [found.get(content_hash) for content_hash in hashes]
+
+    def put_many(self, texts: List[str], embeddings: List[List[float]]) -> None:
+        """
+        Store embeddings (as float32) for texts.
+
+        Args:
+            texts: Embedded texts
+            embeddings: Embedding per text
+        """
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO embedding_cache (hash, provider, model, vector) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (self.content_hash(text), self.provider, self.model, array("f", embedding).tobytes())
+                    for text, embedding in zip(texts, embeddings)
+                ]
+            )
+
+    async def get_or_embed(
+        self,
+        texts: List[str],
+        embed: Callable[[List[str]], Awaitable[List[List[float]]]]
+    ) -> List[List[float]]:
+        """
+        Return embeddings for texts, calling embed only for cache misses.
+
+        Args:
+            texts: Texts to embed
+            embed: Batch embedding function (e.g. llm_service.get_embeddings)
+
+        Returns:
+            Embedding per text, in order
+        """
+        embeddings = self.get_many(texts)
+        missing = [index for index, embedding in enumerate(embeddings) if embedding is None]
+
+        logger.info(f"🗃️ Embedding cache: {len(texts) - len(missing)} hits, {len(missing)} misses")
+
+        if missing:
+            missing_texts = [texts[index] for index in missing]
+            new_embeddings = await embed(missing_texts)
+            self.put_many(missing_texts, new_embeddings)
+            for index, embedding in zip(missing, new_embeddings):
+                embeddings[index] = embedding
+
+        return embeddings
+
+    def close(self) -> None:
+        """Close the database connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -11,10 +11,54 @@ from openai.types.chat import ChatCompletion
 from openai import APIError, RateLimitError as OpenAIRateLimitError, APITimeoutError
 
 from app.config import settings
-from app.utils.retry import retry_with_exponential_backoff, RetryableError, RateLimitError
+from app.utils.retry import (
+    retry_with_exponential_backoff,
+    RetryableError,
+    RateLimitError,
+    AIMDLimiter,
+    TokenBucket,
+)
 
 logger = logging.getLogger(__name__)
 
+# Adaptive cap on concurrent completion requests to OpenAI
+openai_concurrency_limiter = AIMDLimiter(max_concurrency=settings.openai_max_concurrency)
+
+# Proactive requests-per-minute gate, shared by all completion calls
+openai_rate_limiter = (
+    TokenBucket.per_minute(settings.openai_rpm_limit) if settings.openai_rpm_limit > 0 else None
+)
+
+# OpenAI accepts at most 2048 inputs per embeddings request
+EMBEDDING_BATCH_SIZE = 2048
+
+
+def _parse_retry_after(error: OpenAIRateLimitError) -> Optional[float]:
+    """
+    Extract the Retry-After hint (in seconds) from a rate limit response.
+
+    Args:
+        error: OpenAI rate limit error
+
+    Returns:
+        Seconds to wait, or None if the server did not send a numeric hint
+    """
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+
+    headers = response.headers
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        # HTTP-date form or garbage - fall back to exponential backoff
+        pass
+
+    return None
+
 
 class TokenUsageStats:
     """Track token usage statistics."""
@@ -122,7 +166,10 @@ class LLMService:
             ConnectionError,
             TimeoutError
         ),
-        fallback_model="gpt-4o-mini"
+        fallback_model="gpt-4o-mini",
+        breaker_key="openai",
+        concurrency_limiter=openai_concurrency_limiter,
+        rate_limiter=openai_rate_limiter
     )
     async def generate_completion(
         self,
@@ -191,7 +238,7 @@ class LLMService:
 
         except OpenAIRateLimitError as e:
             logger.warning(f"⚠️ Rate limit hit: {e}")
-            raise RateLimitError(str(e)) from e
+            raise RateLimitError(str(e), retry_after=_parse_retry_after(e)) from e
         except APITimeoutError as e:
             logger.warning(f"⚠️ API timeout: {e}")
             raise RetryableError(str(e)) from e
@@ -346,6 +393,39 @@ Please generate a workflow based on the above reference patterns and user reques
             logger.error(f"❌ Failed to generate embedding: {e}")
             raise
 
+    async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embedding vectors for several texts in as few requests as possible.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Embedding vectors in the same order as texts
+        """
+        if not texts:
+            return []
+
+        if not self._initialized:
+            await self.initialize()
+
+        embeddings: List[List[float]] = []
+        try:
+            for start in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+                response = await self.client.embeddings.create(
+                    model=settings.openai_embedding_model,
+                    input=texts[start:start + EMBEDDING_BATCH_SIZE]
+                )
+                # Results carry their input index; don't rely on response order
+                embeddings.extend(
+                    item.embedding for item in sorted(response.data, key=lambda item: item.index)
+                )
+            return embeddings
+
+        except Exception as e:
+            logger.error(f"❌ Failed to generate embeddings for {len(texts)} texts: {e}")
+            raise
+
     def get_status(self) -> Dict[str, Any]:
         """Get service status."""
         return {
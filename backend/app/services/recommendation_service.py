@@ -12,6 +12,13 @@ from app.services.llm_service import llm_service
 
 logger = logging.getLogger(__name__)
 
+# Description keywords that signal each pattern complexity
+COMPLEXITY_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "simple": ("simple", "basic", "straightforward", "easy"),
+    "moderate": ("moderate", "standard", "typical"),
+    "complex": ("complex", "advanced", "sophisticated", "multi-step"),
+}
+
 
 class RecommendationService:
     """Service for recommending workflow patterns based on requirements."""
@@ -150,6 +157,25 @@ Complexity: [simple|moderate|complex]
         """
         scored = []
 
+        # Invariant across patterns: lower-case the texts once and memoize the
+        # per-complexity keyword score and per-word substring hits
+        desc_lower = description.lower()
+        req_lower = analyzed_requirements.lower()
+        complexity_scores: Dict[str, float] = {}
+        word_hits: Dict[str, bool] = {}
+
+        def complexity_score_for(pattern_complexity: str) -> float:
+            if pattern_complexity not in complexity_scores:
+                keywords = COMPLEXITY_KEYWORDS.get(pattern_complexity, ())
+                keyword_matches = sum(1 for kw in keywords if kw in desc_lower)
+                complexity_scores[pattern_complexity] = (keyword_matches / max(len(keywords), 1)) * 100
+            return complexity_scores[pattern_complexity]
+
+        def word_hit(word: str) -> bool:
+            if word not in word_hits:
+                word_hits[word] = word in desc_lower or word in req_lower
+            return word_hits[word]
+
         for pattern in patterns:
             score = 0.0
             metadata = pattern.get("metadata", {})
@@ -163,31 +189,16 @@ Complexity: [simple|moderate|complex]
             # 2. Complexity match score
             if metadata.get("complexity"):
                 # Give bonus for complexity match in description
-                complexity_keywords = {
-                    "simple": ["simple", "basic", "straightforward", "easy"],
-                    "moderate": ["moderate", "standard", "typical"],
-                    "complex": ["complex", "advanced", "sophisticated", "multi-step"]
-                }
-
-                pattern_complexity = metadata["complexity"]
-                keywords = complexity_keywords.get(pattern_complexity, [])
-
-                desc_lower = description.lower()
-                keyword_matches = sum(1 for kw in keywords if kw in desc_lower)
-
-                complexity_score = (keyword_matches / max(len(keywords), 1)) * 100
-                score += complexity_score * 0.2  # 20% weight
+                score += complexity_score_for(metadata["complexity"]) * 0.2  # 20% weight
 
             # 3. Use case relevance score
             if metadata.get("use_cases"):
                 use_cases = metadata["use_cases"].split(", ")
-                desc_lower = description.lower()
-                req_lower = analyzed_requirements.lower()
 
                 # Check if any use case keywords appear in description
                 relevance_matches = sum(
                     1 for uc in use_cases
-                    if any(word in desc_lower or word in req_lower for word in uc.lower().split())
+                    if any(word_hit(word) for word in uc.lower().split())
                 )
 
                 use_case_score = (relevance_matches / max(len(use_cases), 1)) * 100
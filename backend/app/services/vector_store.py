@@ -82,6 +82,43 @@ class VectorStoreService:
             logger.error(f"❌ Failed to add pattern {pattern_id}: {e}")
             raise
 
+    async def add_patterns_batch(
+        self,
+        pattern_ids: List[str],
+        contents: List[str],
+        metadatas: List[Dict[str, Any]],
+        embeddings: Optional[List[List[float]]] = None
+    ) -> None:
+        """
+        Add several workflow patterns to the vector store in a single write.
+
+        Patterns whose ID already exists are replaced.
+
+        Args:
+            pattern_ids: Unique identifiers for the patterns
+            contents: Text content for each pattern
+            metadatas: Metadata for each pattern
+            embeddings: Pre-computed embeddings (optional, will use ChromaDB's default if not provided)
+        """
+        if not pattern_ids:
+            return
+
+        if not self._initialized:
+            await self.initialize()
+
+        try:
+            self.collection.upsert(
+                ids=pattern_ids,
+                documents=contents,
+                metadatas=metadatas,
+                embeddings=embeddings
+            )
+            logger.info(f"✅ Added {len(pattern_ids)} patterns")
+
+        except Exception as e:
+            logger.error(f"❌ Failed to add {len(pattern_ids)} patterns: {e}")
+            raise
+
     async def search_patterns(
         self,
         query: str,
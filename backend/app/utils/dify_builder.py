@@ -5,6 +5,8 @@ Helper functions to create Dify-compatible nodes and structures.
 Based on real Dify 0.4.0 format.
 """
 from typing import Dict, Any, List, Optional, Union
+import pickle
+import time
 import uuid
 from datetime import datetime
 
@@ -30,6 +32,17 @@ def generate_timestamp_id() -> str:
     return str(int(datetime.now().timestamp() * 1000))
 
 
+def generate_timestamp_ids(count: int) -> List[str]:
+    """
+    Generate several Dify-style timestamp IDs from a single clock read
+
+    IDs are consecutive milliseconds, so they stay ordered and never collide
+    the way back-to-back generate_timestamp_id() calls within 1ms do.
+    """
+    base = time.time_ns() // 1_000_000
+    return [str(base + offset) for offset in range(count)]
+
+
 def generate_uuid() -> str:
     """Generate UUID for prompt IDs etc."""
     return str(uuid.uuid4())
@@ -65,9 +78,10 @@ def build_start_node(
     """
     dify_variables = []
     for var in variables:
+        variable_name = var.get("variable") or var.get("name") or ""
         dify_variables.append({
-            "variable": var.get("variable", var.get("name", "")),
-            "label": var.get("label", var.get("variable", var.get("name", ""))),
+            "variable": variable_name,
+            "label": var.get("label") or variable_name,
             "type": var.get("type", "text-input"),
             "required": var.get("required", True),
             "max_length": var.get("max_length", 48),
@@ -893,6 +907,44 @@ def create_conversation_variable(
 # COMPLETE DSL BUILDERS
 # =============================================================================
 
+# Fixed top-level DSL fields (immutable values only, safe to merge shallowly)
+_BASE_DSL: Dict[str, Any] = {
+    "kind": "app",
+    "version": "0.4.0",
+}
+
+# Default workflow features, pickled once and cloned per build
+_WORKFLOW_FEATURES_TEMPLATE: Dict[str, Any] = {
+    "file_upload": {
+        "image": {
+            "enabled": False,
+            "number_limits": 3,
+            "transfer_methods": ["local_file", "remote_url"]
+        }
+    },
+    "opening_statement": "",
+    "retriever_resource": {
+        "enabled": False
+    },
+    "sensitive_word_avoidance": {
+        "enabled": False
+    },
+    "speech_to_text": {
+        "enabled": False
+    },
+    "suggested_questions": [],
+    "suggested_questions_after_answer": {
+        "enabled": False
+    },
+    "text_to_speech": {
+        "enabled": False,
+        "language": "",
+        "voice": ""
+    }
+}
+_WORKFLOW_FEATURES_PICKLE = pickle.dumps(_WORKFLOW_FEATURES_TEMPLATE)
+
+
 def build_workflow_dsl(
     app_name: str,
     app_description: str,
@@ -921,49 +973,22 @@ def build_workflow_dsl(
     Returns:
         Complete Dify DSL dictionary
     """
-    return {
-        "app": {
-            "name": app_name,
-            "description": app_description,
-            "icon": app_icon,
-            "icon_background": icon_background,
-            "mode": mode,
-            "use_icon_as_answer_icon": False
-        },
-        "kind": "app",
-        "version": "0.4.0",
+    app = {
+        "name": app_name,
+        "description": app_description,
+        "icon": app_icon,
+        "icon_background": icon_background,
+        "mode": mode,
+        "use_icon_as_answer_icon": False
+    }
+
+    return {"app": app} | _BASE_DSL | {
         "dependencies": dependencies or [],
         "workflow": {
             "conversation_variables": conversation_variables or [],
             "environment_variables": [],
-            "features": {
-                "file_upload": {
-                    "image": {
-                        "enabled": False,
-                        "number_limits": 3,
-                        "transfer_methods": ["local_file", "remote_url"]
-                    }
-                },
-                "opening_statement": "",
-                "retriever_resource": {
-                    "enabled": False
-                },
-                "sensitive_word_avoidance": {
-                    "enabled": False
-                },
-                "speech_to_text": {
-                    "enabled": False
-                },
-                "suggested_questions": [],
-                "suggested_questions_after_answer": {
-                    "enabled": False
-                },
-                "text_to_speech": {
-                    "enabled": False,
-                    "language": "",
-                    "voice": ""
-                }
-            },
+            # Fresh deep copy of the static template so callers can edit features freely
+            "features": pickle.loads(_WORKFLOW_FEATURES_PICKLE),
             "graph": {
                 "nodes": nodes,
                 "edges": edges,
@@ -4,11 +4,12 @@ Dify DSL Converter V2
 Complete rewrite based on real Dify 0.4.0 format.
 Converts DSLMaker format to authentic Dify-compatible DSL.
 """
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Callable, Dict, Any, List, Optional, Tuple
 import re
+import time
 
 from app.utils.dify_builder import (
-    generate_timestamp_id,
+    generate_timestamp_ids,
     generate_uuid,
     build_start_node,
     build_end_node,
@@ -22,6 +23,14 @@ from app.utils.dify_builder import (
     parse_variable_reference,
 )
 
+# Shared read-only defaults - never mutate these
+_EMPTY_DICT: Dict[str, Any] = {}
+_EMPTY_LIST: List[Any] = []
+_DEFAULT_POSITION: Dict[str, float] = {"x": 100, "y": 100}
+
+# Pattern: {{#node_id.field#}}
+_VARIABLE_REFERENCE_PATTERN = re.compile(r'\{\{#([^.]+)\.([^#]+)#\}\}')
+
 
 class DifyConverterV2:
     """
@@ -35,6 +44,16 @@ class DifyConverterV2:
         self.node_id_map: Dict[str, str] = {}  # Old ID -> New Dify ID
         self.node_type_map: Dict[str, str] = {}  # Node ID -> Node Type
 
+        # Node type -> converter method
+        self._handlers: Dict[str, Callable[[str, float, float, Dict[str, Any]], Dict[str, Any]]] = {
+            "start": self._convert_start_node,
+            "end": self._convert_end_node,
+            "llm": self._convert_llm_node,
+            "if-else": self._convert_if_else_node,
+            "code": self._convert_code_node,
+            "answer": self._convert_answer_node,
+        }
+
     def convert(self, dslmaker_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Convert DSLMaker format to Dify DSL
@@ -45,22 +64,23 @@ class DifyConverterV2:
         Returns:
             Complete Dify DSL dictionary
         """
-        metadata = dslmaker_data.get("metadata", {})
-        workflow = dslmaker_data.get("workflow", {})
-        graph = workflow.get("graph", {})
+        metadata = dslmaker_data.get("metadata") or _EMPTY_DICT
+        workflow = dslmaker_data.get("workflow") or _EMPTY_DICT
+        graph = workflow.get("graph") or _EMPTY_DICT
+        nodes = graph.get("nodes") or _EMPTY_LIST
 
         # Reset state
         self.node_id_map = {}
         self.node_type_map = {}
 
         # Generate node ID mappings
-        self._generate_node_id_mappings(graph.get("nodes", []))
+        self._generate_node_id_mappings(nodes)
 
         # Convert nodes
-        dify_nodes = self._convert_nodes(graph.get("nodes", []))
+        dify_nodes = self._convert_nodes(nodes)
 
         # Convert edges
-        dify_edges = self._convert_edges(graph.get("edges", []))
+        dify_edges = self._convert_edges(graph.get("edges") or _EMPTY_LIST)
 
         # Detect dependencies
         dependencies = self._detect_dependencies(dify_nodes)
@@ -79,49 +99,40 @@ class DifyConverterV2:
 
     def _generate_node_id_mappings(self, nodes: List[Dict[str, Any]]) -> None:
         """Generate Dify-style timestamp IDs for all nodes"""
-        for node in nodes:
-            old_id = node["id"]
-            node_type = node.get("type") or node.get("data", {}).get("type")
+        node_id_map = self.node_id_map
+        node_type_map = self.node_type_map
+
+        # Generate unique Dify-style IDs in one go
+        new_ids = generate_timestamp_ids(len(nodes))
 
-            # Generate Dify-style ID
-            new_id = generate_timestamp_id()
+        for node, new_id in zip(nodes, new_ids):
+            old_id = node["id"]
+            node_type = node.get("type") or (node.get("data") or _EMPTY_DICT).get("type")
 
-            self.node_id_map[old_id] = new_id
-            self.node_type_map[new_id] = node_type
+            node_id_map[old_id] = new_id
+            node_type_map[new_id] = node_type
 
     def _convert_nodes(self, nodes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Convert all nodes to Dify format"""
-        dify_nodes = []
-
-        for node in nodes:
-            old_id = node["id"]
-            new_id = self.node_id_map[old_id]
-            node_type = node.get("type") or node.get("data", {}).get("type")
-            position = node.get("position", {"x": 100, "y": 100})
-            x, y = position["x"], position["y"]
-            data = node.get("data", {})
-
-            # Convert based on node type
-            if node_type == "start":
-                dify_node = self._convert_start_node(new_id, x, y, data)
-            elif node_type == "end":
-                dify_node = self._convert_end_node(new_id, x, y, data)
-            elif node_type == "llm":
-                dify_node = self._convert_llm_node(new_id, x, y, data)
-            elif node_type == "if-else":
-                dify_node = self._convert_if_else_node(new_id, x, y, data)
-            elif node_type == "code":
-                dify_node = self._convert_code_node(new_id, x, y, data)
-            elif node_type == "answer":
-                dify_node = self._convert_answer_node(new_id, x, y, data)
-            else:
-                # Unsupported node type - create a generic node
-                dify_node = self._create_generic_node(new_id, x, y, node_type, data)
-
-            if dify_node:
-                dify_nodes.append(dify_node)
-
-        return dify_nodes
+        dify_nodes = (self._convert_node(node) for node in nodes)
+        return [dify_node for dify_node in dify_nodes if dify_node]
+
+    def _convert_node(self, node: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Convert a single node to Dify format"""
+        old_id = node["id"]
+        new_id = self.node_id_map[old_id]
+        node_type = node.get("type") or (node.get("data") or _EMPTY_DICT).get("type")
+        position = node.get("position") or _DEFAULT_POSITION
+        x, y = position["x"], position["y"]
+        data = node.get("data") or _EMPTY_DICT
+
+        # Convert based on node type
+        handler = self._handlers.get(node_type)
+        if handler is not None:
+            return handler(new_id, x, y, data)
+
+        # Unsupported node type - create a generic node
+        return self._create_generic_node(new_id, x, y, node_type, data)
 
     def _convert_start_node(
         self,
@@ -131,24 +142,26 @@ class DifyConverterV2:
         data: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Convert start node"""
-        variables = data.get("variables", [])
+        variables = data.get("variables") or _EMPTY_LIST
         title = data.get("title", "Start")
 
         # Convert variables to Dify format
-        dify_variables = []
-        for var in variables:
-            dify_var = {
-                "variable": var.get("variable", var.get("name", "")),
-                "label": var.get("label", var.get("variable", var.get("name", ""))),
-                "type": self._map_variable_type(var.get("type", "string")),
-                "required": var.get("required", True),
-                "max_length": var.get("max_length", 48),
-                "options": var.get("options", [])
-            }
-            dify_variables.append(dify_var)
+        dify_variables = [self._convert_start_variable(var) for var in variables]
 
         return build_start_node(node_id, x, y, dify_variables, title)
 
+    def _convert_start_variable(self, var: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a start node variable to Dify format"""
+        variable_name = var.get("variable") or var.get("name") or ""
+        return {
+            "variable": variable_name,
+            "label": var.get("label") or variable_name,
+            "type": self._map_variable_type(var.get("type", "string")),
+            "required": var.get("required", True),
+            "max_length": var.get("max_length", 48),
+            "options": var.get("options", [])
+        }
+
     def _convert_end_node(
         self,
         node_id: str,
@@ -157,35 +170,31 @@ class DifyConverterV2:
         data: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Convert end node"""
-        outputs = data.get("outputs", [])
+        outputs = data.get("outputs") or _EMPTY_LIST
         title = data.get("title", "End")
 
         # Convert outputs to Dify format
-        dify_outputs = []
-        for output in outputs:
-            if isinstance(output, dict):
-                # Already in correct format
-                variable = output.get("variable", "result")
-                value_selector = output.get("value_selector", [])
-            else:
-                # Old format: {"result": "{{#llm.text#}}"}
-                variable = str(output)
-                value_selector = []
-
-            # Map old node IDs to new ones in value_selector
-            if value_selector and len(value_selector) >= 2:
-                old_node_id = value_selector[0]
-                field = value_selector[1]
-                new_node_id = self.node_id_map.get(old_node_id, old_node_id)
-                value_selector = [new_node_id, field]
-
-            dify_outputs.append({
+        dify_outputs = [
+            {
                 "variable": variable,
-                "value_selector": value_selector
-            })
+                "value_selector": self._map_value_selector(value_selector)
+            }
+            for variable, value_selector in self._normalize_end_outputs(outputs)
+        ]
 
         return build_end_node(node_id, x, y, dify_outputs, title)
 
+    def _normalize_end_outputs(self, outputs: List[Any]) -> List[Tuple[str, List[str]]]:
+        """Normalize end node outputs to (variable, value_selector) pairs"""
+        return [
+            # Already in correct format
+            (output.get("variable", "result"), output.get("value_selector", []))
+            if isinstance(output, dict)
+            # Old format: {"result": "{{#llm.text#}}"}
+            else (str(output), [])
+            for output in outputs
+        ]
+
     def _convert_llm_node(
         self,
         node_id: str,
@@ -195,8 +204,8 @@ class DifyConverterV2:
     ) -> Dict[str, Any]:
         """Convert LLM node"""
         title = data.get("title", "LLM")
-        model = data.get("model", {})
-        prompt_template = data.get("prompt_template", [])
+        model = data.get("model") or _EMPTY_DICT
+        prompt_template = data.get("prompt_template") or _EMPTY_LIST
 
         # Ensure model config has required fields
         model_config = {
@@ -209,20 +218,17 @@ class DifyConverterV2:
             })
         }
 
-        # Convert prompt template and update variable references
-        dify_prompts = []
-        for prompt in prompt_template:
-            prompt_text = prompt.get("text", "")
-            # Update variable references to use new node IDs
-            updated_text = self._update_variable_references(prompt_text)
-
-            dify_prompts.append({
+        # Convert prompt template and update variable references to use new node IDs
+        dify_prompts = [
+            {
                 "id": prompt.get("id", generate_uuid()),
                 "role": prompt.get("role", "user"),
-                "text": updated_text
-            })
+                "text": self._update_variable_references(prompt.get("text", ""))
+            }
+            for prompt in prompt_template
+        ]
 
-        vision_enabled = data.get("vision", {}).get("enabled", False)
+        vision_enabled = (data.get("vision") or _EMPTY_DICT).get("enabled", False)
 
         return build_llm_node(
             node_id, x, y, model_config, dify_prompts, title, vision_enabled
@@ -237,27 +243,21 @@ class DifyConverterV2:
     ) -> Dict[str, Any]:
         """Convert if-else node"""
         title = data.get("title", "IF/ELSE")
-        conditions = data.get("conditions", [])
+        conditions = data.get("conditions") or _EMPTY_LIST
         logical_operator = data.get("logical_operator", "and")
 
-        # Convert conditions and update variable selectors
-        dify_conditions = []
-        for cond in conditions:
-            variable_selector = cond.get("variable_selector", [])
-
-            # Map old node IDs to new ones
-            if variable_selector and len(variable_selector) >= 2:
-                old_node_id = variable_selector[0]
-                field = variable_selector[1]
-                new_node_id = self.node_id_map.get(old_node_id, old_node_id)
-                variable_selector = [new_node_id, field]
-
-            dify_conditions.append({
-                "id": cond.get("id", generate_timestamp_id()),
-                "variable_selector": variable_selector,
+        # Convert conditions and update variable selectors.
+        # Read the clock once and offset per condition for unique, ordered IDs.
+        id_base = time.time_ns() // 1_000_000
+        dify_conditions = [
+            {
+                "id": cond.get("id") or str(id_base + index),
+                "variable_selector": self._map_value_selector(cond.get("variable_selector", [])),
                 "comparison_operator": cond.get("comparison_operator", "is"),
                 "value": cond.get("value", "")
-            })
+            }
+            for index, cond in enumerate(conditions)
+        ]
 
         return build_if_else_node(node_id, x, y, dify_conditions, logical_operator, title)
 
@@ -271,25 +271,17 @@ class DifyConverterV2:
         """Convert code node"""
         title = data.get("title", "Code")
         code = data.get("code", "def main():\n    return {}")
-        variables = data.get("variables", [])
+        variables = data.get("variables") or _EMPTY_LIST
         outputs = data.get("outputs", {})
 
         # Convert variables and update selectors
-        dify_variables = []
-        for var in variables:
-            value_selector = var.get("value_selector", [])
-
-            # Map old node IDs
-            if value_selector and len(value_selector) >= 2:
-                old_node_id = value_selector[0]
-                field = value_selector[1]
-                new_node_id = self.node_id_map.get(old_node_id, old_node_id)
-                value_selector = [new_node_id, field]
-
-            dify_variables.append({
+        dify_variables = [
+            {
                 "variable": var.get("variable", "arg1"),
-                "value_selector": value_selector
-            })
+                "value_selector": self._map_value_selector(var.get("value_selector", []))
+            }
+            for var in variables
+        ]
 
         return build_code_node(node_id, x, y, code, dify_variables, outputs, title)
 
@@ -318,11 +310,13 @@ class DifyConverterV2:
         data: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Create a generic node for unsupported types"""
+        # position/positionAbsolute describe the same point and are never mutated
+        position = {"x": x, "y": y}
         return {
             "id": node_id,
             "type": "custom",
-            "position": {"x": x, "y": y},
-            "positionAbsolute": {"x": x, "y": y},
+            "position": position,
+            "positionAbsolute": position,
             "selected": False,
             "sourcePosition": "right",
             "targetPosition": "left",
@@ -339,27 +333,37 @@ class DifyConverterV2:
 
     def _convert_edges(self, edges: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Convert all edges to Dify format"""
-        dify_edges = []
+        return [self._convert_edge(edge) for edge in edges]
 
-        for edge in edges:
-            old_source = edge["source"]
-            old_target = edge["target"]
+    def _convert_edge(self, edge: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a single edge to Dify format"""
+        node_id_map = self.node_id_map
+        node_type_map = self.node_type_map
 
-            new_source = self.node_id_map.get(old_source, old_source)
-            new_target = self.node_id_map.get(old_target, old_target)
+        old_source = edge["source"]
+        old_target = edge["target"]
 
-            source_type = self.node_type_map.get(new_source, "start")
-            target_type = self.node_type_map.get(new_target, "end")
+        new_source = node_id_map.get(old_source, old_source)
+        new_target = node_id_map.get(old_target, old_target)
 
-            source_handle = edge.get("sourceHandle", "source")
+        source_type = node_type_map.get(new_source, "start")
+        target_type = node_type_map.get(new_target, "end")
 
-            dify_edge = build_edge(
-                new_source, new_target, source_type, target_type, source_handle
-            )
+        source_handle = edge.get("sourceHandle", "source")
 
-            dify_edges.append(dify_edge)
+        return build_edge(
+            new_source, new_target, source_type, target_type, source_handle
+        )
+
+    def _map_value_selector(self, value_selector: List[str]) -> List[str]:
+        """Map the node ID of a [node_id, field] selector to its new Dify ID"""
+        if value_selector and len(value_selector) >= 2:
+            old_node_id = value_selector[0]
+            field = value_selector[1]
+            new_node_id = self.node_id_map.get(old_node_id, old_node_id)
+            return [new_node_id, field]
 
-        return dify_edges
+        return value_selector
 
     def _update_variable_references(self, text: str) -> str:
         """
@@ -367,19 +371,22 @@ class DifyConverterV2:
 
         Converts: {{#old_node_id.field#}} -> {{#new_timestamp_id.field#}}
         """
-        # Pattern: {{#node_id.field#}}
-        pattern = r'\{\{#([^.]+)\.([^#]+)#\}\}'
+        # Most prompts are static text - skip the regex when there is nothing to replace
+        if "{{#" not in text:
+            return text
+
+        node_id_map = self.node_id_map
 
         def replace_ref(match):
             old_node_id = match.group(1)
             field = match.group(2)
 
             # Map to new ID
-            new_node_id = self.node_id_map.get(old_node_id, old_node_id)
+            new_node_id = node_id_map.get(old_node_id, old_node_id)
 
             return make_variable_reference(new_node_id, field)
 
-        return re.sub(pattern, replace_ref, text)
+        return _VARIABLE_REFERENCE_PATTERN.sub(replace_ref, text)
 
     def _map_variable_type(self, var_type: str) -> str:
         """Map DSLMaker variable types to Dify types"""
@@ -400,36 +407,36 @@ class DifyConverterV2:
 
         Returns list of dependency objects
         """
-        dependencies = []
         required_plugins = set()
 
         for node in nodes:
-            node_type = node.get("data", {}).get("type")
+            data = node.get("data") or _EMPTY_DICT
+            node_type = data.get("type")
 
             # Check if node requires specific plugins
             if node_type == "llm":
-                provider = node.get("data", {}).get("model", {}).get("provider", "")
+                provider = (data.get("model") or _EMPTY_DICT).get("provider", "")
                 if provider == "openai":
                     required_plugins.add("langgenius/openai:0.2.6")
 
             elif node_type == "tool":
-                provider_id = node.get("data", {}).get("provider_id", "")
+                provider_id = data.get("provider_id", "")
                 if provider_id == "tavily":
                     required_plugins.add("langgenius/tavily:0.1.2")
                 elif provider_id == "jina":
                     required_plugins.add("langgenius/jina_tool:0.0.7")
 
         # Convert to dependency format
-        for plugin_id in required_plugins:
-            dependencies.append({
+        return [
+            {
                 "current_identifier": None,
                 "type": "marketplace",
                 "value": {
                     "marketplace_plugin_unique_identifier": f"{plugin_id}@{self._generate_plugin_hash()}"
                 }
-            })
-
-        return dependencies
+            }
+            for plugin_id in required_plugins
+        ]
 
     def _generate_plugin_hash(self) -> str:
         """Generate a placeholder plugin hash"""
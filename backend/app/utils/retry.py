@@ -5,8 +5,12 @@ Handles transient errors and API rate limits with intelligent retry strategies
 
 import asyncio
 import logging
-from typing import Callable, Any, Optional, Type, Tuple
+from typing import Callable, Any, Deque, Dict, Optional, Type, Tuple
+from collections import deque
+from enum import Enum
 from functools import wraps
+import re
+import threading
 import time
 import random
 
@@ -20,7 +24,17 @@ class RetryableError(Exception):
 
 class RateLimitError(RetryableError):
     """Exception for API rate limit errors."""
-    pass
+
+    def __init__(self, message: str = "", retry_after: Optional[float] = None):
+        """
+        Initialize rate limit error.
+
+        Args:
+            message: Error message
+            retry_after: Server-provided Retry-After hint in seconds, if any
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
 
 
 class APIError(RetryableError):
@@ -28,14 +42,291 @@ class APIError(RetryableError):
     pass
 
 
+class CircuitOpenError(Exception):
+    """Exception raised when a call is rejected by an open circuit breaker."""
+    pass
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker shared by all calls to one upstream.
+
+    CLOSED: calls flow normally; consecutive retryable failures are counted.
+    OPEN: calls fail fast with CircuitOpenError until reset_timeout elapses.
+    HALF_OPEN: up to half_open_probes trial calls are let through; a success
+    closes the circuit, a failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_probes: int = 1
+    ):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures before the circuit opens
+            reset_timeout: Seconds to stay open before probing again
+            half_open_probes: Trial calls allowed while half-open
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self.state = self.CLOSED
+        self.failure_count = 0
+        self.opened_at = 0.0
+        self._probes_in_flight = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        Check whether a call may proceed.
+
+        Returns:
+            True if the call is allowed, False if it should fail fast
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._probes_in_flight = 0
+
+            if self.state == self.HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_probes:
+                    return False
+                self._probes_in_flight += 1
+
+            return True
+
+    def on_success(self) -> None:
+        """Record a successful call and close the circuit."""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failure_count = 0
+            self._probes_in_flight = 0
+
+    def release(self) -> None:
+        """Give back a half-open probe slot without judging upstream health."""
+        with self._lock:
+            if self._probes_in_flight > 0:
+                self._probes_in_flight -= 1
+
+    def on_failure(self) -> None:
+        """Record a failed call, opening the circuit if the threshold is reached."""
+        with self._lock:
+            self.failure_count += 1
+            if self.state == self.HALF_OPEN or self.failure_count >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self.failure_count = 0
+                self._probes_in_flight = 0
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the circuit is currently rejecting calls."""
+        return self.state == self.OPEN
+
+
+# Circuit breakers shared across decorated functions, keyed by breaker_key
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(key: str, **kwargs) -> CircuitBreaker:
+    """
+    Get or create the shared circuit breaker for an upstream.
+
+    Args:
+        key: Breaker key (e.g. provider name)
+        **kwargs: CircuitBreaker settings, used only when the breaker is created
+
+    Returns:
+        Shared CircuitBreaker instance
+    """
+    breaker = _BREAKERS.get(key)
+    if breaker is None:
+        breaker = _BREAKERS.setdefault(key, CircuitBreaker(**kwargs))
+    return breaker
+
+
+class AIMDLimiter:
+    """
+    Async concurrency limiter with AIMD (additive increase, multiplicative
+    decrease) backpressure.
+
+    Healthy calls raise the limit by alpha; retryable failures (rate limits,
+    timeouts, server errors) multiply it by beta. Use as ``async with limiter:``.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        min_concurrency: int = 1,
+        alpha: float = 0.5,
+        beta: float = 0.5,
+        target_latency: Optional[float] = None,
+        initial_concurrency: Optional[int] = None
+    ):
+        """
+        Initialize limiter.
+
+        Args:
+            max_concurrency: Upper bound on concurrent calls
+            min_concurrency: Lower bound on concurrent calls
+            alpha: Additive increase per healthy call
+            beta: Multiplicative decrease factor on failure (0 < beta < 1)
+            target_latency: Calls slower than this (seconds) don't increase the limit
+            initial_concurrency: Starting limit (default: max_concurrency)
+        """
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.alpha = alpha
+        self.beta = beta
+        self.target_latency = target_latency
+        self.limit = float(initial_concurrency or max_concurrency)
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def concurrency(self) -> int:
+        """Current effective concurrency limit."""
+        return max(self.min_concurrency, int(self.limit))
+
+    async def acquire(self) -> None:
+        """Wait for a free slot."""
+        while self.in_flight >= self.concurrency:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except BaseException:
+                if waiter.done() and not waiter.cancelled():
+                    # Woken, then cancelled before taking the slot: pass the wakeup on
+                    self._wake_waiters()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.in_flight += 1
+
+    def release(self) -> None:
+        """Free a slot."""
+        self.in_flight -= 1
+        self._wake_waiters()
+
+    def on_success(self, latency: float) -> None:
+        """Additively increase the limit after a healthy call."""
+        if self.target_latency is None or latency <= self.target_latency:
+            self.limit = min(float(self.max_concurrency), self.limit + self.alpha)
+            self._wake_waiters()
+
+    def on_error(self) -> None:
+        """Multiplicatively decrease the limit after a failed call."""
+        self.limit = max(float(self.min_concurrency), self.limit * self.beta)
+
+    def _wake_waiters(self) -> None:
+        free_slots = self.concurrency - self.in_flight
+        while free_slots > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free_slots -= 1
+
+    async def __aenter__(self) -> "AIMDLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.release()
+
+
+class TokenBucket:
+    """
+    Async token bucket for proactive rate limiting (e.g. requests per minute).
+
+    Callers wait for capacity up front instead of being rejected with a 429.
+    """
+
+    def __init__(self, capacity: float, refill_rate: float):
+        """
+        Initialize token bucket.
+
+        Args:
+            capacity: Maximum burst size in tokens
+            refill_rate: Tokens added per second
+        """
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    @classmethod
+    def per_minute(cls, limit: float) -> "TokenBucket":
+        """Create a bucket allowing `limit` tokens per minute."""
+        return cls(capacity=limit, refill_rate=limit / 60.0)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+
+    async def acquire(self, cost: float = 1.0) -> None:
+        """
+        Wait until `cost` tokens are available and consume them.
+
+        Args:
+            cost: Tokens to consume (1 per request, or a token estimate for TPM budgets)
+        """
+        if cost > self.capacity:
+            raise ValueError(f"Cost {cost} exceeds bucket capacity {self.capacity}")
+
+        while True:
+            self._refill()
+            if self.tokens >= cost:
+                self.tokens -= cost
+                return
+            # Sleep exactly until enough tokens have accumulated
+            await asyncio.sleep((cost - self.tokens) / self.refill_rate)
+
+
+class RetryDecision(Enum):
+    """How the retry loop should react to a retryable exception."""
+
+    RETRY_FAST = "retry_fast"
+    RETRY_SLOW = "retry_slow"
+    NO_RETRY = "no_retry"
+
+
+# Supported jitter strategies (see _apply_jitter)
+JITTER_MODES = ("full", "equal", "none")
+
+# Fraction of a Retry-After hint added as jitter (always waits at least the hint)
+RETRY_AFTER_JITTER = 0.1
+
+# Base delay multiplier for RetryDecision.RETRY_SLOW (still capped by max_delay)
+SLOW_RETRY_FACTOR = 4.0
+
+
 def retry_with_exponential_backoff(
     max_retries: int = 3,
     base_delay: float = 1.0,
     max_delay: float = 60.0,
     exponential_base: float = 2.0,
     jitter: bool = True,
+    jitter_mode: str = "full",
     retryable_exceptions: Tuple[Type[Exception], ...] = (RetryableError, TimeoutError, ConnectionError),
     fallback_model: Optional[str] = None,
+    breaker_key: Optional[str] = None,
+    concurrency_limiter: Optional[AIMDLimiter] = None,
+    rate_limiter: Optional[TokenBucket] = None,
+    deadline: Optional[float] = None,
+    classifier: Optional[Callable[[Exception], RetryDecision]] = None,
 ):
     """
     Decorator for retrying functions with exponential backoff.
@@ -46,8 +337,20 @@ def retry_with_exponential_backoff(
         max_delay: Maximum delay between retries (default: 60.0)
         exponential_base: Base for exponential calculation (default: 2.0)
         jitter: Add random jitter to prevent thundering herd (default: True)
+        jitter_mode: "full" (uniform in [0, delay]), "equal" (uniform in [delay/2, delay])
+            or "none" (default: "full")
         retryable_exceptions: Tuple of exceptions to retry (default: RetryableError, TimeoutError, ConnectionError)
         fallback_model: Fallback model to use after max retries (default: None)
+        breaker_key: Share a circuit breaker with other functions using the same key;
+            calls fail fast with CircuitOpenError while it is open (default: None)
+        concurrency_limiter: AIMD limiter bounding concurrent calls; async functions
+            only, ValueError when decorating a sync function (default: None)
+        rate_limiter: Token bucket acquired before each attempt; async functions only,
+            ValueError when decorating a sync function (default: None)
+        deadline: Total time budget in seconds across all attempts and backoff sleeps;
+            once spent, the last error is raised without further retries (default: None)
+        classifier: Maps a retryable exception to a RetryDecision; NO_RETRY raises at once,
+            RETRY_SLOW backs off from a larger base delay (default: classify_retry)
 
     Returns:
         Decorated function with retry logic
@@ -57,124 +360,286 @@ def retry_with_exponential_backoff(
         async def call_api():
             return await client.make_request()
     """
-    def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        async def async_wrapper(*args, **kwargs) -> Any:
-            last_exception = None
+    if jitter_mode not in JITTER_MODES:
+        raise ValueError(f"Invalid jitter_mode '{jitter_mode}'. Must be one of: {JITTER_MODES}")
+    if not jitter:
+        jitter_mode = "none"
+
+    # The backoff schedule is fixed by the arguments above, so compute it once
+    backoff_delays = tuple(
+        min(base_delay * (exponential_base ** attempt), max_delay)
+        for attempt in range(max_retries)
+    )
+    slow_backoff_delays = tuple(
+        min(delay * SLOW_RETRY_FACTOR, max_delay) for delay in backoff_delays
+    )
+
+    classify = classifier or classify_retry
+
+    breaker = get_circuit_breaker(breaker_key) if breaker_key else None
+
+    def _check_breaker(func: Callable) -> None:
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError(
+                f"Circuit '{breaker_key}' is open; failing fast for {func.__name__}"
+            )
+
+    def _compute_delay(error: Exception, attempt: int, decision: RetryDecision) -> float:
+        # Honor the server's Retry-After hint instead of guessing
+        if isinstance(error, RateLimitError) and error.retry_after is not None:
+            delay = min(error.retry_after, max_delay)
+            # Narrow jitter so blocked clients don't all resume at the same instant
+            return delay * (1.0 + _jitter_random() * RETRY_AFTER_JITTER)
+
+        # Look up the precomputed exponential backoff delay
+        if decision is RetryDecision.RETRY_SLOW:
+            delay = slow_backoff_delays[attempt]
+        else:
+            delay = backoff_delays[attempt]
+
+        # Add jitter to prevent thundering herd
+        return _apply_jitter(delay, jitter_mode)
+
+    def _clamp_to_deadline(delay: float, started: float) -> Optional[float]:
+        # Returns the delay cut to the remaining budget, or None if the budget is spent
+        if deadline is None:
+            return delay
+        remaining = deadline - (time.monotonic() - started)
+        if remaining <= 0:
+            return None
+        return min(delay, remaining)
+
+    def _on_success(attempt: int) -> None:
+        if breaker is not None:
+            breaker.on_success()
+        if attempt > 0:
+            logger.info("✅ Retry successful on attempt %d/%d", attempt + 1, max_retries + 1)
+
+    def _on_fatal_error(func: Callable, error: Exception) -> None:
+        # Non-retryable error - the caller re-raises immediately
+        if breaker is not None:
+            breaker.release()
+        logger.error("❌ Non-retryable error in %s: %s", func.__name__, error, exc_info=True)
+
+    def _on_abort() -> None:
+        # The call never finished, so it says nothing about upstream health
+        if breaker is not None:
+            breaker.release()
+
+    def _next_delay(func: Callable, error: Exception, attempt: int, started: float) -> Optional[float]:
+        """
+        Decide what to do after a retryable error.
 
-            for attempt in range(max_retries + 1):
+        Returns:
+            Seconds to back off before the next attempt, or None when the caller
+            should give up and re-raise
+        """
+        decision = classify(error)
+        if decision is RetryDecision.NO_RETRY:
+            # Retrying can't help (e.g. a 4xx) and says nothing about upstream health
+            if breaker is not None:
+                breaker.release()
+            logger.error("❌ Non-retryable error in %s: %s", func.__name__, error)
+            return None
+
+        if breaker is not None:
+            breaker.on_failure()
+            if breaker.is_open:
+                raise CircuitOpenError(
+                    f"Circuit '{breaker_key}' opened after failure in {func.__name__}: {error}"
+                ) from error
+
+        # Never sleep on the terminal failure path
+        if attempt >= max_retries:
+            logger.error("❌ Max retries (%d) exceeded for %s: %s", max_retries, func.__name__, error)
+            return None
+
+        delay = _clamp_to_deadline(_compute_delay(error, attempt, decision), started)
+        if delay is None:
+            logger.error("❌ Retry deadline (%.2fs) exceeded for %s: %s", deadline, func.__name__, error)
+            return None
+
+        # Categorize error for logging (skipped when warnings are filtered)
+        if logger.isEnabledFor(logging.WARNING):
+            logger.warning(
+                "⚠️ %s error in %s (attempt %d/%d): %s\n   Retrying in %.2fs...",
+                _categorize_error(error), func.__name__, attempt + 1, max_retries + 1,
+                error, delay
+            )
+        return delay
+
+    def decorator(func: Callable) -> Callable:
+        # Only build the wrapper this function needs: async functions must never
+        # reach the blocking time.sleep() in the sync path.
+        if asyncio.iscoroutinefunction(func):
+            return _build_async_wrapper(func)
+        if concurrency_limiter is not None or rate_limiter is not None:
+            raise ValueError(
+                f"concurrency_limiter and rate_limiter require an async function; "
+                f"{func.__name__} is synchronous"
+            )
+        return _build_sync_wrapper(func)
+
+    def _build_async_wrapper(func: Callable) -> Callable:
+        async def call(*args, **kwargs) -> Any:
+            if rate_limiter is not None:
+                # Wait for budget before taking a concurrency slot
+                await rate_limiter.acquire()
+
+            if concurrency_limiter is None:
+                return await func(*args, **kwargs)
+
+            async with concurrency_limiter:
+                started = time.perf_counter()
                 try:
-                    # Execute function
                     result = await func(*args, **kwargs)
+                except retryable_exceptions:
+                    # Upstream is struggling - back off concurrency
+                    concurrency_limiter.on_error()
+                    raise
+                concurrency_limiter.on_success(time.perf_counter() - started)
+                return result
+
+        async def call_fallback(error: Exception, args: tuple, kwargs: dict) -> Any:
+            """Try fallback_model once; re-raise `error` if that fails too."""
+            logger.info("🔄 Attempting fallback to model: %s", fallback_model)
+            try:
+                # Same limiters as any other attempt; don't mutate the caller's kwargs
+                result = await call(*args, **{**kwargs, "model": fallback_model})
+            except Exception as fallback_error:
+                if breaker is not None and isinstance(fallback_error, retryable_exceptions):
+                    breaker.on_failure()
+                logger.error("❌ Fallback also failed: %s", fallback_error)
+            else:
+                if breaker is not None:
+                    breaker.on_success()
+                return result
+            raise error
 
-                    # Log successful retry
-                    if attempt > 0:
-                        logger.info(f"✅ Retry successful on attempt {attempt + 1}/{max_retries + 1}")
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs) -> Any:
+            started = time.monotonic()
 
-                    return result
+            for attempt in range(max_retries + 1):
+                # Fail fast while the upstream is known to be down
+                _check_breaker(func)
 
+                try:
+                    result = await call(*args, **kwargs)
                 except retryable_exceptions as e:
-                    last_exception = e
-
-                    # Check if we've exhausted retries
-                    if attempt >= max_retries:
-                        logger.error(
-                            f"❌ Max retries ({max_retries}) exceeded for {func.__name__}: {e}"
-                        )
-
-                        # Try fallback model if specified
+                    try:
+                        delay = _next_delay(func, e, attempt, started)
+                    except CircuitOpenError as circuit_error:
+                        # This upstream just tripped the breaker; the fallback model may still answer
                         if fallback_model and "model" in kwargs:
-                            logger.info(f"🔄 Attempting fallback to model: {fallback_model}")
-                            try:
-                                kwargs["model"] = fallback_model
-                                return await func(*args, **kwargs)
-                            except Exception as fallback_error:
-                                logger.error(f"❌ Fallback also failed: {fallback_error}")
-
-                        raise last_exception
-
-                    # Calculate delay with exponential backoff
-                    delay = min(base_delay * (exponential_base ** attempt), max_delay)
-
-                    # Add jitter to prevent thundering herd
-                    if jitter:
-                        delay = delay * (0.5 + random.random())
-
-                    # Categorize error for logging
-                    error_category = _categorize_error(e)
-
-                    logger.warning(
-                        f"⚠️ {error_category} error in {func.__name__} (attempt {attempt + 1}/{max_retries + 1}): {e}\n"
-                        f"   Retrying in {delay:.2f}s..."
-                    )
-
-                    # Wait before retry
+                            return await call_fallback(circuit_error, args, kwargs)
+                        raise
+                    if delay is None:
+                        # Try fallback model once retries are exhausted
+                        if attempt >= max_retries and fallback_model and "model" in kwargs:
+                            return await call_fallback(e, args, kwargs)
+                        raise
                     await asyncio.sleep(delay)
-
                 except Exception as e:
-                    # Non-retryable error - fail immediately
-                    logger.error(
-                        f"❌ Non-retryable error in {func.__name__}: {e}",
-                        exc_info=True
-                    )
+                    _on_fatal_error(func, e)
+                    raise
+                except BaseException:
+                    # Cancelled (e.g. timed out by asyncio.wait_for): free the probe slot
+                    _on_abort()
                     raise
+                else:
+                    _on_success(attempt)
+                    return result
 
-            # This should never be reached, but just in case
-            if last_exception:
-                raise last_exception
+        return async_wrapper
 
+    def _build_sync_wrapper(func: Callable) -> Callable:
         @wraps(func)
         def sync_wrapper(*args, **kwargs) -> Any:
             """Synchronous wrapper for non-async functions."""
-            last_exception = None
+            started = time.monotonic()
 
             for attempt in range(max_retries + 1):
+                _check_breaker(func)
+
                 try:
                     result = func(*args, **kwargs)
-
-                    if attempt > 0:
-                        logger.info(f"✅ Retry successful on attempt {attempt + 1}/{max_retries + 1}")
-
+                except retryable_exceptions as e:
+                    delay = _next_delay(func, e, attempt, started)
+                    if delay is None:
+                        raise
+                    time.sleep(delay)
+                except Exception as e:
+                    _on_fatal_error(func, e)
+                    raise
+                except BaseException:
+                    _on_abort()
+                    raise
+                else:
+                    _on_success(attempt)
                     return result
 
-                except retryable_exceptions as e:
-                    last_exception = e
+        return sync_wrapper
 
-                    if attempt >= max_retries:
-                        logger.error(
-                            f"❌ Max retries ({max_retries}) exceeded for {func.__name__}: {e}"
-                        )
-                        raise last_exception
+    return decorator
 
-                    delay = min(base_delay * (exponential_base ** attempt), max_delay)
-                    if jitter:
-                        delay = delay * (0.5 + random.random())
 
-                    error_category = _categorize_error(e)
-                    logger.warning(
-                        f"⚠️ {error_category} error in {func.__name__} (attempt {attempt + 1}/{max_retries + 1}): {e}\n"
-                        f"   Retrying in {delay:.2f}s..."
-                    )
+# Per-thread RNG for jitter so concurrent retries don't share the global Random
+# instance. Not cryptographic - it only spreads out backoff delays.
+_jitter_rng = threading.local()
 
-                    time.sleep(delay)
 
-                except Exception as e:
-                    logger.error(
-                        f"❌ Non-retryable error in {func.__name__}: {e}",
-                        exc_info=True
-                    )
-                    raise
+def _jitter_random() -> float:
+    """Return a float in [0, 1) from this thread's jitter RNG."""
+    rng = getattr(_jitter_rng, "rng", None)
+    if rng is None:
+        rng = _jitter_rng.rng = random.Random()
+    return rng.random()
 
-            if last_exception:
-                raise last_exception
 
-        # Return appropriate wrapper based on whether function is async
-        if asyncio.iscoroutinefunction(func):
-            return async_wrapper
-        else:
-            return sync_wrapper
+def _apply_jitter(delay: float, jitter_mode: str) -> float:
+    """
+    Randomize a backoff delay.
 
-    return decorator
+    Args:
+        delay: Deterministic backoff delay in seconds
+        jitter_mode: One of JITTER_MODES
+
+    Returns:
+        Jittered delay in seconds
+    """
+    if jitter_mode == "full":
+        return _jitter_random() * delay
+    elif jitter_mode == "equal":
+        return delay * (0.5 + _jitter_random() * 0.5)
+    else:
+        return delay
+
+
+# Error categories in priority order (first match wins)
+_ERROR_CATEGORIES = ("Rate Limit", "Timeout", "Connection", "Service Unavailable", "Server Error")
+_ERROR_PRIORITY = {category: priority for priority, category in enumerate(_ERROR_CATEGORIES)}
+_NO_CATEGORY = len(_ERROR_CATEGORIES)
+
+_ERROR_TYPE_CATEGORIES = {
+    RateLimitError: "Rate Limit",
+    TimeoutError: "Timeout",
+    ConnectionError: "Connection",
+}
+
+_ERROR_TEXT_CATEGORIES = {
+    "rate limit": "Rate Limit",
+    "429": "Rate Limit",
+    "timeout": "Timeout",
+    "connection": "Connection",
+    "503": "Service Unavailable",
+    "service unavailable": "Service Unavailable",
+    "500": "Server Error",
+    "internal server error": "Server Error",
+}
+_ERROR_TEXT_PATTERN = re.compile(
+    "|".join(re.escape(marker) for marker in _ERROR_TEXT_CATEGORIES), re.IGNORECASE
+)
 
 
 def _categorize_error(error: Exception) -> str:
@@ -187,20 +652,72 @@ def _categorize_error(error: Exception) -> str:
     Returns:
         Error category string
     """
-    error_str = str(error).lower()
-
-    if isinstance(error, RateLimitError) or "rate limit" in error_str or "429" in error_str:
-        return "Rate Limit"
-    elif isinstance(error, TimeoutError) or "timeout" in error_str:
-        return "Timeout"
-    elif isinstance(error, ConnectionError) or "connection" in error_str:
-        return "Connection"
-    elif "503" in error_str or "service unavailable" in error_str:
-        return "Service Unavailable"
-    elif "500" in error_str or "internal server error" in error_str:
-        return "Server Error"
-    else:
-        return "Transient"
+    priority = _NO_CATEGORY
+
+    # Nearest known exception type in the MRO (isinstance semantics)
+    for cls in type(error).__mro__:
+        category = _ERROR_TYPE_CATEGORIES.get(cls)
+        if category is not None:
+            priority = _ERROR_PRIORITY[category]
+            break
+
+    # One scan of the message for status codes / keywords
+    for match in _ERROR_TEXT_PATTERN.finditer(str(error)):
+        if priority == 0:
+            break
+        priority = min(priority, _ERROR_PRIORITY[_ERROR_TEXT_CATEGORIES[match.group(0).lower()]])
+
+    return _ERROR_CATEGORIES[priority] if priority < _NO_CATEGORY else "Transient"
+
+
+# Error categories worth backing off from more patiently
+_SLOW_CATEGORIES = frozenset({"Rate Limit", "Service Unavailable"})
+
+# Transport failures stay retryable whatever their message says ("read timeout after 400 ms")
+_TRANSPORT_CATEGORIES = frozenset({"Timeout", "Connection"})
+
+# 4xx statuses that may succeed on a later attempt
+_RETRYABLE_CLIENT_STATUSES = frozenset({408, 409, 429})
+
+_CLIENT_ERROR_PATTERN = re.compile(
+    r"\b(?:400|401|403|404|422)\b|bad request|not found|unauthorized|forbidden",
+    re.IGNORECASE
+)
+
+
+def classify_retry(error: Exception) -> RetryDecision:
+    """
+    Default retry classifier.
+
+    Client errors (4xx) are not retried, rate limits without a Retry-After hint
+    and overloaded services back off slowly, everything else retries normally.
+
+    Args:
+        error: Retryable exception raised by the wrapped function
+
+    Returns:
+        RetryDecision for the error
+    """
+    # Status codes from the error itself or the SDK error it wraps
+    for candidate in (error, error.__cause__):
+        status_code = getattr(candidate, "status_code", None)
+        if isinstance(status_code, int) and 400 <= status_code < 500:
+            if status_code not in _RETRYABLE_CLIENT_STATUSES:
+                return RetryDecision.NO_RETRY
+
+    category = _categorize_error(error)
+    if category == "Rate Limit":
+        if getattr(error, "retry_after", None) is not None:
+            return RetryDecision.RETRY_FAST
+        return RetryDecision.RETRY_SLOW
+
+    # Without a status code, fall back to the message, but never for transport failures
+    if category not in _TRANSPORT_CATEGORIES and _CLIENT_ERROR_PATTERN.search(str(error)):
+        return RetryDecision.NO_RETRY
+
+    if category in _SLOW_CATEGORIES:
+        return RetryDecision.RETRY_SLOW
+    return RetryDecision.RETRY_FAST
 
 
 class RetryConfig:
@@ -212,7 +729,9 @@ class RetryConfig:
         base_delay: float = 1.0,
         max_delay: float = 60.0,
         exponential_base: float = 2.0,
-        jitter: bool = True
+        jitter: bool = True,
+        jitter_mode: str = "full",
+        deadline: Optional[float] = None
     ):
         """
         Initialize retry configuration.
@@ -223,12 +742,16 @@ class RetryConfig:
             max_delay: Maximum delay in seconds
             exponential_base: Exponential growth factor
             jitter: Whether to add random jitter
+            jitter_mode: Jitter strategy ("full", "equal" or "none")
+            deadline: Total retry time budget in seconds (None for no limit)
         """
         self.max_retries = max_retries
         self.base_delay = base_delay
         self.max_delay = max_delay
         self.exponential_base = exponential_base
         self.jitter = jitter
+        self.jitter_mode = jitter_mode
+        self.deadline = deadline
 
     def to_decorator_kwargs(self) -> dict:
         """Convert to decorator keyword arguments."""
@@ -237,7 +760,9 @@ class RetryConfig:
             "base_delay": self.base_delay,
             "max_delay": self.max_delay,
             "exponential_base": self.exponential_base,
-            "jitter": self.jitter
+            "jitter": self.jitter,
+            "jitter_mode": self.jitter_mode,
+            "deadline": self.deadline
         }
 
 
@@ -249,7 +774,8 @@ CONSERVATIVE_RETRY = RetryConfig(
     base_delay=2.0,
     max_delay=120.0,
     exponential_base=2.0,
-    jitter=True
+    jitter=True,
+    jitter_mode="full"
 )
 
 # Aggressive retry for non-critical operations
@@ -258,7 +784,8 @@ AGGRESSIVE_RETRY = RetryConfig(
     base_delay=0.5,
     max_delay=30.0,
     exponential_base=1.5,
-    jitter=True
+    jitter=True,
+    jitter_mode="full"
 )
 
 # Quick retry for fast-failing operations
@@ -267,5 +794,6 @@ QUICK_RETRY = RetryConfig(
     base_delay=0.5,
     max_delay=5.0,
     exponential_base=2.0,
-    jitter=False
+    jitter=False,
+    jitter_mode="none"
 )
@@ -18,6 +18,12 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from app.utils.dify_builder import *
 from app.models.dify_models import DifyDSL
 
+try:
+    # libyaml C emitter - much faster than the pure-Python dumper
+    from yaml import CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeDumper
+
 
 def main():
     print("=" * 70)
@@ -26,82 +32,21 @@ def main():
     print()
 
     # Generate unique IDs
-    start_id = generate_timestamp_id()
-    search_tool_id = generate_timestamp_id()
-    extract_code_id = generate_timestamp_id()
-    iter_id = generate_timestamp_id()
-    reader_tool_id = generate_timestamp_id()
-    summarize_llm_id = generate_timestamp_id()
-    combine_template_id = generate_timestamp_id()
-    final_code_id = generate_timestamp_id()
-    end_id = generate_timestamp_id()
+    (
+        start_id,
+        search_tool_id,
+        extract_code_id,
+        iter_id,
+        reader_tool_id,
+        summarize_llm_id,
+        combine_template_id,
+        final_code_id,
+        end_id,
+    ) = generate_timestamp_ids(9)
 
     print("Step 1: Creating nodes...")
-    nodes = []
-
-    # 1. Start node
-    nodes.append(build_start_node(
-        start_id, 30, 100,
-        variables=[{
-            "variable": "query",
-            "label": "Search Query",
-            "type": "text-input",
-            "required": True
-        }],
-        title="Start"
-    ))
-
-    # 2. Tavily Search tool
-    nodes.append(build_tool_node(
-        search_tool_id, 300, 100,
-        provider_id="tavily",
-        tool_name="tavily_search",
-        tool_parameters={
-            "query": {
-                "type": "mixed",
-                "value": make_variable_reference(start_id, "query")
-            }
-        },
-        tool_configurations={
-            "search_depth": "basic",
-            "max_results": 5
-        },
-        title="Web Search"
-    ))
-
-    # 3. Code node to extract URLs
-    nodes.append(build_code_node(
-        extract_code_id, 600, 100,
-        code="""import re
-def main(search_results):
-    urls = re.findall(r'http[s]?://[^\\s)]+', str(search_results))
-    return {"result": urls[:3]}  # Top 3 URLs
-""",
-        variables=[{
-            "variable": "search_results",
-            "value_selector": [search_tool_id, "text"]
-        }],
-        outputs={
-            "result": {"type": "array[string]", "children": None}
-        },
-        title="Extract URLs"
-    ))
-
-    # 4. Iteration node (container)
-    nodes.append(build_iteration_node(
-        iter_id, 900, 100,
-        iterator_selector=[extract_code_id, "result"],
-        output_selector=[combine_template_id, "output"],
-        output_type="array[string]",
-        start_node_type="tool",
-        width=800,
-        height=250,
-        title="Process Each URL"
-    ))
-
-    # 5. Iteration-start node
-    nodes.append(build_iteration_start_node(iter_id, 24, 60))
 
+    # Nodes inside the iteration need extra fields, so build them up front
     # 6. Jina Reader tool (inside iteration)
     reader_node = build_tool_node(
         reader_tool_id, 100, 60,
@@ -122,97 +67,163 @@ def main(search_results):
     reader_node["zIndex"] = 1001
     reader_node["data"]["isInIteration"] = True
     reader_node["data"]["iteration_id"] = iter_id
-    nodes.append(reader_node)
-
-    # 7. LLM node (inside iteration)
-    llm_node = build_llm_node(
-        summarize_llm_id, 400, 60,
-        model_config={
-            "provider": "openai",
-            "name": "gpt-4",
-            "mode": "chat",
-            "completion_params": {"temperature": 0.7}
-        },
-        prompt_template=[
-            {
-                "role": "system",
-                "text": f"Summarize this content in 2-3 sentences:\\n{make_variable_reference(reader_tool_id, 'text')}"
-            }
-        ],
-        title="Summarize",
-        in_iteration=True,
-        iteration_id=iter_id
-    )
-    nodes.append(llm_node)
-
-    # 8. Template transform (inside iteration)
-    template_node = build_template_transform_node(
-        combine_template_id, 650, 60,
-        template="URL: {{ url }}\\nSummary: {{ summary }}",
-        variables=[
-            {"variable": "url", "value_selector": [iter_id, "item"]},
-            {"variable": "summary", "value_selector": [summarize_llm_id, "text"]}
-        ],
-        title="Format Result",
-        in_iteration=True,
-        iteration_id=iter_id
-    )
-    nodes.append(template_node)
 
-    # 9. Code node to join results
-    nodes.append(build_code_node(
-        final_code_id, 1750, 100,
-        code="""def main(summaries):
+    nodes = [
+        # 1. Start node
+        build_start_node(
+            start_id, 30, 100,
+            variables=[{
+                "variable": "query",
+                "label": "Search Query",
+                "type": "text-input",
+                "required": True
+            }],
+            title="Start"
+        ),
+
+        # 2. Tavily Search tool
+        build_tool_node(
+            search_tool_id, 300, 100,
+            provider_id="tavily",
+            tool_name="tavily_search",
+            tool_parameters={
+                "query": {
+                    "type": "mixed",
+                    "value": make_variable_reference(start_id, "query")
+                }
+            },
+            tool_configurations={
+                "search_depth": "basic",
+                "max_results": 5
+            },
+            title="Web Search"
+        ),
+
+        # 3. Code node to extract URLs
+        build_code_node(
+            extract_code_id, 600, 100,
+            code="""import re
+_URL_RE = re.compile(r'http[s]?://[^\\s)]+')
+def main(search_results):
+    urls = _URL_RE.findall(str(search_results))
+    return {"result": urls[:3]}  # Top 3 URLs
+""",
+            variables=[{
+                "variable": "search_results",
+                "value_selector": [search_tool_id, "text"]
+            }],
+            outputs={
+                "result": {"type": "array[string]", "children": None}
+            },
+            title="Extract URLs"
+        ),
+
+        # 4. Iteration node (container)
+        build_iteration_node(
+            iter_id, 900, 100,
+            iterator_selector=[extract_code_id, "result"],
+            output_selector=[combine_template_id, "output"],
+            output_type="array[string]",
+            start_node_type="tool",
+            width=800,
+            height=250,
+            title="Process Each URL"
+        ),
+
+        # 5. Iteration-start node
+        build_iteration_start_node(iter_id, 24, 60),
+
+        # 6. Jina Reader tool (inside iteration)
+        reader_node,
+
+        # 7. LLM node (inside iteration)
+        build_llm_node(
+            summarize_llm_id, 400, 60,
+            model_config={
+                "provider": "openai",
+                "name": "gpt-4",
+                "mode": "chat",
+                "completion_params": {"temperature": 0.7}
+            },
+            prompt_template=[
+                {
+                    "role": "system",
+                    "text": f"Summarize this content in 2-3 sentences:\\n{make_variable_reference(reader_tool_id, 'text')}"
+                }
+            ],
+            title="Summarize",
+            in_iteration=True,
+            iteration_id=iter_id
+        ),
+
+        # 8. Template transform (inside iteration)
+        build_template_transform_node(
+            combine_template_id, 650, 60,
+            template="URL: {{ url }}\\nSummary: {{ summary }}",
+            variables=[
+                {"variable": "url", "value_selector": [iter_id, "item"]},
+                {"variable": "summary", "value_selector": [summarize_llm_id, "text"]}
+            ],
+            title="Format Result",
+            in_iteration=True,
+            iteration_id=iter_id
+        ),
+
+        # 9. Code node to join results
+        build_code_node(
+            final_code_id, 1750, 100,
+            code="""def main(summaries):
     return {"result": "\\n\\n".join(summaries)}
 """,
-        variables=[{
-            "variable": "summaries",
-            "value_selector": [iter_id, "output"]
-        }],
-        outputs={
-            "result": {"type": "string", "children": None}
-        },
-        title="Combine Results"
-    ))
-
-    # 10. End node
-    nodes.append(build_end_node(
-        end_id, 2050, 100,
-        outputs=[{
-            "variable": "final_result",
-            "value_selector": [final_code_id, "result"]
-        }],
-        title="End"
-    ))
+            variables=[{
+                "variable": "summaries",
+                "value_selector": [iter_id, "output"]
+            }],
+            outputs={
+                "result": {"type": "string", "children": None}
+            },
+            title="Combine Results"
+        ),
+
+        # 10. End node
+        build_end_node(
+            end_id, 2050, 100,
+            outputs=[{
+                "variable": "final_result",
+                "value_selector": [final_code_id, "result"]
+            }],
+            title="End"
+        ),
+    ]
 
     print(f"   Created {len(nodes)} nodes")
 
     print("\nStep 2: Creating edges...")
-    edges = []
-
-    # Main flow edges
-    edges.append(build_edge(start_id, search_tool_id, "start", "tool"))
-    edges.append(build_edge(search_tool_id, extract_code_id, "tool", "code"))
-    edges.append(build_edge(extract_code_id, iter_id, "code", "iteration"))
-    edges.append(build_edge(iter_id, final_code_id, "iteration", "code"))
-    edges.append(build_edge(final_code_id, end_id, "code", "end"))
-
-    # Iteration internal edges
-    edges.append(build_edge(
-        f"{iter_id}start0", reader_tool_id,
-        "iteration-start", "tool",
-        in_iteration=True, iteration_id=iter_id
-    ))
-    edges.append(build_edge(
-        reader_tool_id, summarize_llm_id,
-        "tool", "llm",
-        in_iteration=True, iteration_id=iter_id
-    ))
-    edges.append(build_edge(
-        summarize_llm_id, combine_template_id,
-        "llm", "template-transform",
-        in_iteration=True, iteration_id=iter_id
-    ))
+    edges = [
+        # Main flow edges
+        build_edge(start_id, search_tool_id, "start", "tool"),
+        build_edge(search_tool_id, extract_code_id, "tool", "code"),
+        build_edge(extract_code_id, iter_id, "code", "iteration"),
+        build_edge(iter_id, final_code_id, "iteration", "code"),
+        build_edge(final_code_id, end_id, "code", "end"),
+
+        # Iteration internal edges
+        build_edge(
+            f"{iter_id}start0", reader_tool_id,
+            "iteration-start", "tool",
+            in_iteration=True, iteration_id=iter_id
+        ),
+        build_edge(
+            reader_tool_id, summarize_llm_id,
+            "tool", "llm",
+            in_iteration=True, iteration_id=iter_id
+        ),
+        build_edge(
+            summarize_llm_id, combine_template_id,
+            "llm", "template-transform",
+            in_iteration=True, iteration_id=iter_id
+        ),
+    ]
 
     print(f"   Created {len(edges)} edges")
 
@@ -256,7 +267,7 @@ def main(search_results):
 
     print("\nStep 5: Validating with Pydantic...")
     try:
-        validated_dsl = DifyDSL(**dsl)
+        validated_dsl = DifyDSL.model_validate(dsl)
         print("   ✅ Validation passed!")
         print(f"   - App: {validated_dsl.app.name}")
         print(f"   - Mode: {validated_dsl.app.mode}")
@@ -270,7 +281,8 @@ def main(search_results):
     print("\nStep 6: Saving to file...")
     output_path = Path(__file__).parent / "example_workflow.yaml"
     with open(output_path, 'w', encoding='utf-8') as f:
-        yaml.dump(dsl, f, allow_unicode=True, sort_keys=False)
+        # Stream straight into the file instead of building the document in memory
+        yaml.dump(dsl, f, Dumper=SafeDumper, allow_unicode=True, sort_keys=False)
 
     print(f"   ✅ Saved to: {output_path}")
     print(f"   File size: {output_path.stat().st_size:,} bytes")
@@ -4,38 +4,119 @@ Extract node examples from real Dify workflows for agent prompts
 
 import yaml
 import json
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from collections import defaultdict
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 
-def extract_node_examples(samples_dir: str) -> Dict[str, List[Dict]]:
-    """Extract examples of each node type from Dify samples"""
+try:
+    # libyaml C binding - several times faster than the pure-Python loader
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+def _load_yaml(yaml_file: Path) -> Any:
+    """Parse a YAML file with the fastest available safe loader"""
+    with open(yaml_file, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+def _node_examples_from(data: Dict[str, Any], source_file: str) -> Dict[str, List[Dict]]:
+    """Extract examples of each node type from a parsed Dify sample"""
     node_examples = defaultdict(list)
 
-    samples_path = Path(samples_dir)
-    for yaml_file in samples_path.glob("*.yaml"):
-        try:
-            with open(yaml_file, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-
-            nodes = data.get('workflow', {}).get('graph', {}).get('nodes', [])
-            for node in nodes:
-                node_type = node.get('data', {}).get('type', 'unknown')
-                if node_type and node_type != 'unknown':
-                    # Store a clean example
-                    example = {
-                        'id': node.get('id', ''),
-                        'type': node_type,
-                        'data': node.get('data', {}),
-                        'position': node.get('position', {}),
-                        'source_file': yaml_file.name
-                    }
-                    node_examples[node_type].append(example)
-        except Exception as e:
-            print(f"Error processing {yaml_file}: {e}")
+    nodes = data.get('workflow', {}).get('graph', {}).get('nodes', [])
+    for node in nodes:
+        node_type = node.get('data', {}).get('type', 'unknown')
+        if node_type and node_type != 'unknown':
+            # Store a clean example
+            example = {
+                'id': node.get('id', ''),
+                'type': node_type,
+                'data': node.get('data', {}),
+                'position': node.get('position', {}),
+                'source_file': source_file
+            }
+            node_examples[node_type].append(example)
 
     return dict(node_examples)
 
+def _pattern_from(data: Dict[str, Any], source_file: str) -> Dict:
+    """Extract the workflow pattern of a parsed Dify sample"""
+    workflow_name = data.get('app', {}).get('name', 'Unknown')
+    workflow_desc = data.get('app', {}).get('description', '')
+    nodes = data.get('workflow', {}).get('graph', {}).get('nodes', [])
+    edges = data.get('workflow', {}).get('graph', {}).get('edges', [])
+
+    # Extract node types sequence
+    node_types = [n.get('data', {}).get('type', '') for n in nodes if n.get('data', {}).get('type')]
+
+    # Determine pattern type
+    pattern_type = "unknown"
+    if "iteration" in node_types:
+        pattern_type = "iteration"
+    elif "knowledge-retrieval" in node_types or "document-extractor" in node_types:
+        pattern_type = "rag"
+    elif "if-else" in node_types:
+        pattern_type = "conditional"
+    elif "tool" in node_types:
+        pattern_type = "tool_integration"
+    elif len(node_types) <= 5:
+        pattern_type = "simple_chain"
+    else:
+        pattern_type = "complex"
+
+    return {
+        'name': workflow_name,
+        'description': workflow_desc,
+        'type': pattern_type,
+        'node_count': len(nodes),
+        'edge_count': len(edges),
+        'node_types': list(set(node_types)),
+        'node_sequence': node_types,
+        'source_file': source_file
+    }
+
+def _process_file(yaml_file: Path) -> Tuple[Dict[str, List[Dict]], Optional[Dict]]:
+    """Parse a Dify sample once and extract both its node examples and pattern"""
+    try:
+        data = _load_yaml(yaml_file)
+    except Exception as e:
+        print(f"Error processing {yaml_file}: {e}")
+        return {}, None
+
+    try:
+        node_examples = _node_examples_from(data, yaml_file.name)
+    except Exception as e:
+        print(f"Error processing {yaml_file}: {e}")
+        node_examples = {}
+
+    try:
+        pattern = _pattern_from(data, yaml_file.name)
+    except Exception as e:
+        print(f"Error extracting pattern from {yaml_file}: {e}")
+        pattern = None
+
+    return node_examples, pattern
+
+def scan_directory(samples_dir: str) -> Tuple[Dict[str, List[Dict]], List[Dict]]:
+    """
+    Extract node examples and workflow patterns from Dify samples in one pass.
+
+    Each YAML file is read and parsed exactly once, spread across all CPU cores.
+    """
+    node_examples = defaultdict(list)
+    patterns = []
+
+    yaml_files = list(Path(samples_dir).glob("*.yaml"))
+    with ProcessPoolExecutor() as executor:
+        for file_examples, pattern in executor.map(_process_file, yaml_files):
+            for node_type, examples in file_examples.items():
+                node_examples[node_type].extend(examples)
+            if pattern is not None:
+                patterns.append(pattern)
+
+    return dict(node_examples), patterns
+
 def generate_prompt_templates(node_examples: Dict[str, List[Dict]]) -> str:
     """Generate prompt templates with real examples"""
 
@@ -63,70 +144,17 @@ def generate_prompt_templates(node_examples: Dict[str, List[Dict]]) -> str:
 
     return template
 
-def extract_common_patterns(samples_dir: str) -> List[Dict]:
-    """Extract common workflow patterns"""
-    patterns = []
-
-    samples_path = Path(samples_dir)
-    for yaml_file in samples_path.glob("*.yaml"):
-        try:
-            with open(yaml_file, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-
-            workflow_name = data.get('app', {}).get('name', 'Unknown')
-            workflow_desc = data.get('app', {}).get('description', '')
-            nodes = data.get('workflow', {}).get('graph', {}).get('nodes', [])
-            edges = data.get('workflow', {}).get('graph', {}).get('edges', [])
-
-            # Extract node types sequence
-            node_types = [n.get('data', {}).get('type', '') for n in nodes if n.get('data', {}).get('type')]
-
-            # Determine pattern type
-            pattern_type = "unknown"
-            if "iteration" in node_types:
-                pattern_type = "iteration"
-            elif "knowledge-retrieval" in node_types or "document-extractor" in node_types:
-                pattern_type = "rag"
-            elif "if-else" in node_types:
-                pattern_type = "conditional"
-            elif "tool" in node_types:
-                pattern_type = "tool_integration"
-            elif len(node_types) <= 5:
-                pattern_type = "simple_chain"
-            else:
-                pattern_type = "complex"
-
-            pattern = {
-                'name': workflow_name,
-                'description': workflow_desc,
-                'type': pattern_type,
-                'node_count': len(nodes),
-                'edge_count': len(edges),
-                'node_types': list(set(node_types)),
-                'node_sequence': node_types,
-                'source_file': yaml_file.name
-            }
-            patterns.append(pattern)
-
-        except Exception as e:
-            print(f"Error extracting pattern from {yaml_file}: {e}")
-
-    return patterns
-
 def main():
     # Extract from both v1 and v2 samples
-    all_examples = {}
+    all_examples = defaultdict(list)
     all_patterns = []
 
     for samples_dir in ['backend/knowledge_base/dify_samples', 'backend/knowledge_base/dify_samples_v2']:
         print(f"\n📂 Processing {samples_dir}...")
-        examples = extract_node_examples(samples_dir)
-        patterns = extract_common_patterns(samples_dir)
+        examples, patterns = scan_directory(samples_dir)
 
         # Merge examples
         for node_type, examples_list in examples.items():
-            if node_type not in all_examples:
-                all_examples[node_type] = []
             all_examples[node_type].extend(examples_list)
 
         all_patterns.extend(patterns)
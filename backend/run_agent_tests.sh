@@ -19,17 +19,19 @@ fi
 
 # Install test dependencies if needed
 echo "📦 Checking dependencies..."
-pip install -q pytest pytest-asyncio pytest-cov 2>/dev/null || true
+pip install -q pytest pytest-asyncio pytest-cov pytest-xdist pytest-timeout 2>/dev/null || true
 
 # Run tests with coverage
 echo ""
 echo "🏃 Running tests..."
 echo ""
 
-# Run only agent tests
+# Run only agent tests (tests are LLM-bound, so spread them across workers)
 python -m pytest \
     tests/agents/ \
     -v \
+    -n auto \
+    --dist=loadfile \
     --tb=short \
     --cov=app/agents \
     --cov-report=term-missing \
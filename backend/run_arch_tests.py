@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Concurrent harness for ArchitectureAgent scenarios
+
+Runs the same cases as tests/agents/test_architecture_agent.py. Every case is
+independent (requirements -> execute -> checks), so all agent calls are
+dispatched at once behind a semaphore sized to the OpenAI concurrency limit,
+then the cheap checks run sequentially.
+"""
+import asyncio
+import sys
+import time
+from typing import Any
+
+from app.agents.architecture_agent import ArchitectureAgent
+from app.config import settings
+from app.graph.state import ClarifiedRequirements
+from tests.agents.arch_cases import ARCH_CASES, REQUIREMENTS, make_base_state
+
+
+async def run_scenarios(max_concurrency: int = None) -> int:
+    """
+    Run all cases concurrently and check each result.
+
+    Args:
+        max_concurrency: Concurrent agent calls (default: settings.openai_max_concurrency)
+
+    Returns:
+        Number of failed cases
+    """
+    agent = ArchitectureAgent()
+    semaphore = asyncio.Semaphore(max_concurrency or settings.openai_max_concurrency)
+
+    async def bounded_execute(requirements: ClarifiedRequirements) -> Any:
+        async with semaphore:
+            return await agent.execute({**make_base_state(), "requirements": requirements})
+
+    start = time.perf_counter_ns()
+    results = await asyncio.gather(
+        *(bounded_execute(REQUIREMENTS[name]()) for _, name, _ in ARCH_CASES), return_exceptions=True
+    )
+    elapsed_ns = time.perf_counter_ns() - start
+
+    failures = 0
+    for (case_id, _, checks), result in zip(ARCH_CASES, results):
+        try:
+            if isinstance(result, BaseException):
+                raise result
+            assert result["architecture"] is not None
+            for check in checks:
+                check(result["architecture"])
+            print(f"✅ {case_id}")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {case_id}: {type(e).__name__}: {e}")
+
+    print(f"\n📊 {len(ARCH_CASES) - failures}/{len(ARCH_CASES)} passed in {elapsed_ns / 1e9:.2f}s")
+    return failures
+
+
+if __name__ == '__main__':
+    sys.exit(1 if asyncio.run(run_scenarios()) else 0)
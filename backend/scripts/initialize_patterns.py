@@ -5,17 +5,26 @@ Loads workflow patterns from YAML files into ChromaDB vector store
 """
 
 import asyncio
+import json
 import logging
+import os
 import sys
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import yaml
 
+try:
+    # libyaml C binding - much faster than the pure-Python loader
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.services.vector_store import vector_store
 from app.services.llm_service import llm_service
+from app.services.embedding_cache import EmbeddingCache
 
 logging.basicConfig(
     level=logging.INFO,
@@ -25,41 +34,80 @@ logger = logging.getLogger(__name__)
 
 PATTERNS_DIR = Path(__file__).parent.parent / "knowledge_base" / "patterns"
 
+# Manifest of pattern file mtimes from the last load (see PatternLoader.incremental)
+PATTERNS_INDEX_FILE = ".patterns_index.json"
+
+# Header of the searchable pattern document (see create_pattern_document)
+PATTERN_DOCUMENT_TEMPLATE = (
+    "Pattern: {name}\n"
+    "ID: {pattern_id}\n"
+    "Description: {description}\n"
+    "Complexity: {complexity}\n"
+    "Node Types: {node_types_str}\n"
+    "Estimated Nodes: {estimated_nodes}"
+)
+
 
 class PatternLoader:
     """Load workflow patterns from YAML files into vector store."""
 
-    def __init__(self, patterns_dir: Path):
+    def __init__(
+        self,
+        patterns_dir: Path,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        incremental: bool = False,
+        write_index: Optional[bool] = None
+    ):
         """
         Initialize pattern loader.
 
         Args:
             patterns_dir: Directory containing pattern YAML files
+            embedding_cache: Cache consulted before embedding documents (default: on-disk cache)
+            incremental: Only load files whose mtime changed since the last recorded load,
+                and drop patterns whose files were deleted since then
+            write_index: Record the manifest after loading (default: same as incremental)
         """
         self.patterns_dir = patterns_dir
+        self.incremental = incremental
+        self.write_index = incremental if write_index is None else write_index
+        self.index_path = patterns_dir / PATTERNS_INDEX_FILE
+        self.embedding_cache = embedding_cache or EmbeddingCache()
         self.loaded_count = 0
         self.failed_count = 0
         self.errors: List[Dict[str, str]] = []
 
-    def load_yaml_file(self, file_path: Path) -> Dict[str, Any]:
+    def read_yaml_file(self, file_path: Path) -> Tuple[str, Dict[str, Any]]:
         """
-        Load and parse a YAML file.
+        Read a YAML file once and parse it.
 
         Args:
             file_path: Path to YAML file
 
         Returns:
-            Parsed YAML content as dictionary
+            Tuple of (raw file text, parsed YAML content as dictionary)
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = yaml.safe_load(f)
-                logger.debug(f"✅ Loaded YAML: {file_path.name}")
-                return content
+            text = file_path.read_text(encoding='utf-8')
+            content = yaml.load(text, Loader=SafeLoader)
+            logger.debug(f"✅ Loaded YAML: {file_path.name}")
+            return text, content
         except Exception as e:
             logger.error(f"❌ Failed to load {file_path.name}: {e}")
             raise
 
+    def load_yaml_file(self, file_path: Path) -> Dict[str, Any]:
+        """
+        Load and parse a YAML file.
+
+        Args:
+            file_path: Path to YAML file
+
+        Returns:
+            Parsed YAML content as dictionary
+        """
+        return self.read_yaml_file(file_path)[1]
+
     def extract_pattern_metadata(self, pattern_data: Dict, file_name: str) -> Dict[str, Any]:
         """
         Extract metadata from pattern data.
@@ -91,8 +139,7 @@ class PatternLoader:
             metadata["estimated_nodes"] = len(nodes)
 
             # Extract unique node types
-            node_types = set(node.get("data", {}).get("type", "") for node in nodes)
-            metadata["node_types"] = sorted(list(node_types))
+            metadata["node_types"] = sorted({node.get("data", {}).get("type", "") for node in nodes})
 
             # Estimate complexity based on node count
             if len(nodes) <= 4:
@@ -116,73 +163,151 @@ class PatternLoader:
             Formatted document string for embedding
         """
         # Build comprehensive document for semantic search
-        doc_parts = [
-            f"Pattern: {metadata['name']}",
-            f"ID: {metadata['pattern_id']}",
-            f"Description: {metadata['description']}",
-            f"Complexity: {metadata['complexity']}",
-            f"Node Types: {', '.join(metadata['node_types'])}",
-            f"Estimated Nodes: {metadata['estimated_nodes']}",
-        ]
+        document = PATTERN_DOCUMENT_TEMPLATE.format_map(
+            {**metadata, "node_types_str": ", ".join(metadata["node_types"])}
+        )
 
         # Add node details for better context
         nodes = pattern_data.get("app", {}).get("nodes", [])
         if nodes:
-            doc_parts.append("\nWorkflow Structure:")
-            for node in nodes[:10]:  # Limit to first 10 nodes
-                node_data = node.get("data", {})
-                node_title = node_data.get("title", "Untitled")
-                node_type = node_data.get("type", "unknown")
-                doc_parts.append(f"- {node_title} ({node_type})")
+            node_lines = "\n".join(
+                f"- {node_data.get('title', 'Untitled')} ({node_data.get('type', 'unknown')})"
+                for node_data in (node.get("data", {}) for node in nodes[:10])  # First 10 nodes
+            )
+            document = f"{document}\n\nWorkflow Structure:\n{node_lines}"
 
-        return "\n".join(doc_parts)
+        return document
 
-    async def load_single_pattern(self, file_path: Path) -> bool:
+    def prepare_pattern(self, file_path: Path) -> Dict[str, Any]:
         """
-        Load a single pattern file into vector store.
+        Build everything needed to store a pattern except its embedding.
 
         Args:
             file_path: Path to pattern YAML file
 
         Returns:
-            True if successful, False otherwise
+            Dictionary with file, pattern_id, document, content and metadata
         """
-        try:
-            # Load YAML
-            pattern_data = self.load_yaml_file(file_path)
+        # Load YAML, keeping the raw text
+        raw_content, pattern_data = self.read_yaml_file(file_path)
 
-            # Extract metadata
-            metadata = self.extract_pattern_metadata(pattern_data, file_path.name)
+        # Extract metadata
+        metadata = self.extract_pattern_metadata(pattern_data, file_path.name)
 
-            # Create searchable document
-            document = self.create_pattern_document(pattern_data, metadata)
+        return {
+            "file": file_path.name,
+            "pattern_id": metadata["pattern_id"],
+            # Searchable document (this is what gets embedded)
+            "document": self.create_pattern_document(pattern_data, metadata),
+            # Store pattern content (the original YAML, no need to re-emit it)
+            "content": raw_content,
+            "metadata": metadata
+        }
 
-            # Store pattern content (full YAML as JSON)
-            pattern_content = yaml.dump(pattern_data, default_flow_style=False)
+    def _record_loaded(self, pattern: Dict[str, Any]) -> None:
+        metadata = pattern["metadata"]
+        logger.info(
+            f"✅ Loaded pattern: {metadata['name']} "
+            f"({metadata['complexity']}, {metadata['estimated_nodes']} nodes)"
+        )
+        self.loaded_count += 1
+
+    def _record_failure(self, file_name: str, error: Exception) -> None:
+        logger.error(f"❌ Failed to load pattern {file_name}: {error}")
+        self.failed_count += 1
+        self.errors.append({
+            "file": file_name,
+            "error": str(error)
+        })
+
+    async def store_patterns(
+        self,
+        patterns: List[Dict[str, Any]],
+        embeddings: List[List[float]]
+    ) -> None:
+        """
+        Write prepared patterns to the vector store in a single batch.
 
-            # Add to vector store
-            await vector_store.add_pattern(
-                pattern_id=metadata["pattern_id"],
-                content=pattern_content,
-                metadata=metadata
-            )
+        Falls back to adding patterns one by one if the batch is rejected, so a
+        single malformed record only fails itself.
 
-            logger.info(
-                f"✅ Loaded pattern: {metadata['name']} "
-                f"({metadata['complexity']}, {metadata['estimated_nodes']} nodes)"
+        Args:
+            patterns: Patterns from prepare_pattern
+            embeddings: Embedding per pattern
+        """
+        try:
+            await vector_store.add_patterns_batch(
+                pattern_ids=[pattern["pattern_id"] for pattern in patterns],
+                contents=[pattern["content"] for pattern in patterns],
+                metadatas=[pattern["metadata"] for pattern in patterns],
+                embeddings=embeddings
             )
+        except Exception as e:
+            logger.warning(f"⚠️ Batch add failed ({e}), adding patterns individually")
+            for pattern, embedding in zip(patterns, embeddings):
+                try:
+                    await vector_store.add_pattern(
+                        pattern_id=pattern["pattern_id"],
+                        content=pattern["content"],
+                        metadata=pattern["metadata"],
+                        embedding=embedding
+                    )
+                except Exception as pattern_error:
+                    self._record_failure(pattern["file"], pattern_error)
+                else:
+                    self._record_loaded(pattern)
+        else:
+            for pattern in patterns:
+                self._record_loaded(pattern)
+
+    def scan_pattern_files(self) -> Dict[str, int]:
+        """
+        List pattern YAML files in a single directory pass.
 
-            self.loaded_count += 1
-            return True
+        Returns:
+            {file name: mtime_ns} for every *.yaml file, sorted by name
+        """
+        # DirEntry reuses the directory listing, so there is no per-file path resolution
+        with os.scandir(self.patterns_dir) as entries:
+            found = {
+                entry.name: entry.stat().st_mtime_ns
+                for entry in entries
+                if entry.name.endswith(".yaml") and not entry.name.startswith(".") and entry.is_file()
+            }
+        return dict(sorted(found.items()))
 
-        except Exception as e:
-            logger.error(f"❌ Failed to load pattern {file_path.name}: {e}")
-            self.failed_count += 1
-            self.errors.append({
-                "file": file_path.name,
-                "error": str(e)
-            })
-            return False
+    def load_index(self) -> Dict[str, int]:
+        """Load the {file name: mtime_ns} manifest of the last load."""
+        try:
+            return json.loads(self.index_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+
+    def save_index(self, index: Dict[str, int]) -> None:
+        """Persist the {file name: mtime_ns} manifest."""
+        try:
+            self.index_path.write_text(json.dumps(index, indent=2, sort_keys=True), encoding='utf-8')
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write pattern index {self.index_path}: {e}")
+
+    async def remove_patterns(self, removed: Dict[str, int]) -> Dict[str, int]:
+        """
+        Delete the patterns of files that disappeared since the last recorded load.
+
+        Args:
+            removed: {file name: mtime_ns} manifest entries with no file left
+
+        Returns:
+            Entries that could not be deleted (kept in the manifest to retry next time)
+        """
+        stale = {}
+        for name, mtime in removed.items():
+            try:
+                await vector_store.delete_pattern(name.replace('.yaml', ''))
+            except Exception as e:
+                logger.warning(f"⚠️ Could not remove deleted pattern {name}: {e}")
+                stale[name] = mtime
+        return stale
 
     async def load_all_patterns(self) -> Dict[str, Any]:
         """
@@ -198,27 +323,79 @@ class PatternLoader:
             raise FileNotFoundError(f"Patterns directory not found: {self.patterns_dir}")
 
         # Find all YAML files
-        pattern_files = sorted(self.patterns_dir.glob("*.yaml"))
+        current_index = self.scan_pattern_files()
+
+        # Drop patterns whose files were deleted since the last recorded load
+        previous_index = self.load_index() if self.incremental else {}
+        removed = {name: mtime for name, mtime in previous_index.items() if name not in current_index}
+        stale = await self.remove_patterns(removed)
+        if removed:
+            logger.info(f"🗑️ Removed {len(removed) - len(stale)} deleted pattern files")
 
-        if not pattern_files:
+        if not current_index:
             logger.warning(f"⚠️ No YAML files found in {self.patterns_dir}")
+            if self.write_index:
+                self.save_index(stale)
             return {
                 "total_found": 0,
+                "skipped": 0,
                 "loaded": 0,
+                "removed": len(removed) - len(stale),
                 "failed": 0,
                 "errors": []
             }
 
-        logger.info(f"📁 Found {len(pattern_files)} pattern files")
+        logger.info(f"📁 Found {len(current_index)} pattern files")
+
+        # Skip files that are unchanged since the last recorded load
+        pattern_files = [
+            self.patterns_dir / name for name, mtime in current_index.items()
+            if mtime != previous_index.get(name)
+        ]
+        skipped = len(current_index) - len(pattern_files)
+        if skipped:
+            logger.info(f"⏭️ Skipping {skipped} unchanged pattern files")
+
+        # Parse every file first so all documents can be embedded in one request.
+        # Reads run in worker threads so the event loop (the API server during
+        # startup) is not blocked on disk I/O.
+        prepared = await asyncio.gather(
+            *(asyncio.to_thread(self.prepare_pattern, file_path) for file_path in pattern_files),
+            return_exceptions=True
+        )
 
-        # Load each pattern
-        for file_path in pattern_files:
-            await self.load_single_pattern(file_path)
+        patterns = []
+        for file_path, result in zip(pattern_files, prepared):
+            if isinstance(result, Exception):
+                self._record_failure(file_path.name, result)
+            else:
+                patterns.append(result)
+
+        if patterns:
+            try:
+                embeddings = await self.embedding_cache.get_or_embed(
+                    [pattern["document"] for pattern in patterns], llm_service.get_embeddings
+                )
+            except Exception as e:
+                for pattern in patterns:
+                    self._record_failure(pattern["file"], e)
+            else:
+                await self.store_patterns(patterns, embeddings)
+
+        # Record what is now loaded; failed loads and removals are retried next time
+        if self.write_index:
+            failed_files = {error["file"] for error in self.errors}
+            self.save_index({
+                **stale,
+                **{name: mtime for name, mtime in current_index.items() if name not in failed_files}
+            })
 
         # Summary
         summary = {
-            "total_found": len(pattern_files),
+            "total_found": len(current_index),
+            "skipped": skipped,
             "loaded": self.loaded_count,
+            "removed": len(removed) - len(stale),
             "failed": self.failed_count,
             "errors": self.errors
         }
@@ -231,12 +408,13 @@ class PatternLoader:
         return summary
 
 
-async def initialize_patterns(force_reload: bool = False) -> Dict[str, Any]:
+async def initialize_patterns(force_reload: bool = False, changed_only: bool = False) -> Dict[str, Any]:
     """
     Initialize patterns in vector store.
 
     Args:
         force_reload: If True, reload even if patterns already exist
+        changed_only: If True, only reload pattern files changed since the last load
 
     Returns:
         Summary statistics
@@ -251,7 +429,7 @@ async def initialize_patterns(force_reload: bool = False) -> Dict[str, Any]:
         stats = vector_store.get_collection_stats()
         existing_patterns = stats.get("total_patterns", 0)
 
-        if existing_patterns > 0 and not force_reload:
+        if existing_patterns > 0 and not (force_reload or changed_only):
             logger.info(
                 f"✅ Vector store already contains {existing_patterns} patterns. "
                 f"Use --force to reload."
@@ -267,8 +445,16 @@ async def initialize_patterns(force_reload: bool = False) -> Dict[str, Any]:
             # Note: ChromaDB doesn't have a clear method, so we'll just overwrite
 
         # Load patterns
-        loader = PatternLoader(PATTERNS_DIR)
-        summary = await loader.load_all_patterns()
+        # An empty store always gets a full load; only --changed-only keeps the manifest
+        loader = PatternLoader(
+            PATTERNS_DIR,
+            incremental=changed_only and existing_patterns > 0,
+            write_index=changed_only
+        )
+        try:
+            summary = await loader.load_all_patterns()
+        finally:
+            loader.embedding_cache.close()
 
         # Verify loading
         new_stats = vector_store.get_collection_stats()
@@ -300,6 +486,11 @@ async def main():
         action="store_true",
         help="Force reload even if patterns already exist"
     )
+    parser.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="Only reload pattern files changed since the last load"
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -313,10 +504,14 @@ async def main():
 
     logger.info("🚀 Starting pattern initialization...")
 
-    result = await initialize_patterns(force_reload=args.force)
+    result = await initialize_patterns(force_reload=args.force, changed_only=args.changed_only)
 
     if result["status"] == "success":
         logger.info(f"✅ Success: {result['loaded']} patterns loaded")
+        if result.get("skipped", 0) > 0:
+            logger.info(f"⏭️ {result['skipped']} unchanged patterns skipped")
+        if result.get("removed", 0) > 0:
+            logger.info(f"🗑️ {result['removed']} deleted patterns removed")
         if result.get("failed", 0) > 0:
             logger.warning(f"⚠️ {result['failed']} patterns failed to load")
             for error in result.get("errors", []):
@@ -331,4 +526,10 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        # uvloop ships with uvicorn[standard]; fall back to the default loop without it
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -3,24 +3,32 @@ Script to load workflow patterns into ChromaDB
 """
 
 import asyncio
+import os
 import yaml
 from pathlib import Path
 import sys
 
+try:
+    # libyaml C binding - much faster than the pure-Python loader
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 # Add parent directory to path to import app modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.services.vector_store import vector_store
 from app.services.llm_service import llm_service
+from app.services.embedding_cache import EmbeddingCache
 
 
-async def load_pattern_file(file_path: Path):
-    """Load a single pattern file and add to vector store."""
+def load_pattern_file(file_path: Path):
+    """Load a single pattern file and build its vector store record."""
     print(f"📄 Loading pattern: {file_path.name}")
 
     try:
         with open(file_path, 'r') as f:
-            pattern_data = yaml.safe_load(f)
+            pattern_data = yaml.load(f, Loader=SafeLoader)
 
         metadata = pattern_data['metadata']
         workflow = pattern_data['workflow']
@@ -41,9 +49,6 @@ Workflow Structure:
 Node Types: {', '.join([node['type'] for node in workflow['graph']['nodes']])}
 """
 
-        # Generate embedding
-        embedding = await llm_service.get_embedding(content)
-
         # Flatten metadata for ChromaDB (convert lists to strings)
         flat_metadata = {
             'pattern_id': metadata['pattern_id'],
@@ -55,18 +60,15 @@ Node Types: {', '.join([node['type'] for node in workflow['graph']['nodes']])}
             'tags': ', '.join(metadata['tags'])  # Convert list to string
         }
 
-        # Add to vector store
-        await vector_store.add_pattern(
-            pattern_id=metadata['pattern_id'],
-            content=content,
-            metadata=flat_metadata,
-            embedding=embedding
-        )
-
-        print(f"✅ Loaded: {metadata['name']} ({metadata['pattern_id']})")
+        return {
+            'pattern_id': metadata['pattern_id'],
+            'content': content,
+            'metadata': flat_metadata
+        }
 
     except Exception as e:
         print(f"❌ Failed to load {file_path.name}: {e}")
+        return None
 
 
 async def main():
@@ -81,7 +83,11 @@ async def main():
 
     # Find all pattern files
     patterns_dir = Path(__file__).parent.parent / "knowledge_base" / "patterns"
-    pattern_files = list(patterns_dir.glob("*.yaml"))
+    with os.scandir(patterns_dir) as entries:
+        pattern_files = [
+            Path(entry.path) for entry in entries
+            if entry.name.endswith(".yaml") and not entry.name.startswith(".") and entry.is_file()
+        ]
 
     if not pattern_files:
         print("⚠️ No pattern files found!")
@@ -89,9 +95,31 @@ async def main():
 
     print(f"📚 Found {len(pattern_files)} pattern(s)\n")
 
-    # Load each pattern
-    for pattern_file in pattern_files:
-        await load_pattern_file(pattern_file)
+    # Read each pattern off the event loop, then embed and store them all in one batch
+    loaded = await asyncio.gather(
+        *(asyncio.to_thread(load_pattern_file, pattern_file) for pattern_file in pattern_files)
+    )
+    records = [record for record in loaded if record]
+
+    if records:
+        # Only content that changed since the last run is sent to the embedding API
+        embedding_cache = EmbeddingCache()
+        try:
+            embeddings = await embedding_cache.get_or_embed(
+                [record['content'] for record in records], llm_service.get_embeddings
+            )
+        finally:
+            embedding_cache.close()
+
+        await vector_store.add_patterns_batch(
+            pattern_ids=[record['pattern_id'] for record in records],
+            contents=[record['content'] for record in records],
+            metadatas=[record['metadata'] for record in records],
+            embeddings=embeddings
+        )
+
+        for record in records:
+            print(f"✅ Loaded: {record['metadata']['name']} ({record['pattern_id']})")
 
     # Show final stats
     print("\n📊 Final Statistics:")
@@ -103,4 +131,10 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    try:
+        # uvloop ships with uvicorn[standard]; fall back to the default loop without it
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
\ No newline at end of file
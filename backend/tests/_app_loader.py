@@ -0,0 +1,15 @@
+"""
+Lazy loader for the FastAPI application
+Importing app.main builds the full agent/service graph, so it happens once per process
+"""
+
+import functools
+
+from fastapi import FastAPI
+
+
+@functools.lru_cache(maxsize=1)
+def get_app() -> FastAPI:
+    """Return the application, importing app.main on first use"""
+    from app.main import app
+    return app
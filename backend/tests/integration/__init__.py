@@ -0,0 +1,3 @@
+"""
+Integration Tests Package
+"""
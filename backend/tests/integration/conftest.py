@@ -0,0 +1,326 @@
+"""
+Shared fixtures for integration tests
+Replaces the LLM and external services with deterministic offline mocks
+"""
+
+import functools
+import json
+import re
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import Runnable
+
+from app.agents.base import BaseAgent
+from app.graph.state import QualityAssessment
+from app.services.llm_service import llm_service
+from app.services.recommendation_service import recommendation_service
+from app.services.vector_store import vector_store
+from tests._app_loader import get_app
+from tests.conftest import RECORD_MODE, REPLAY_AVAILABLE
+
+
+# Compiled once; the mock runs on every agent call
+_USER_REQ_RE = re.compile(r"user request:\s*(.*?)\s*similar successful workflows", re.DOTALL)
+_BUSINESS_INTENT_RE = re.compile(r"business intent: (.*)")
+_NODE_TYPES_RE = re.compile(r"^- node types: (.*)$", re.MULTILINE)
+_WORD_RE = re.compile(r"[a-z]+")
+
+# keyword -> pattern tag, so one pass over the request words finds every category
+_KEYWORD_TAGS: Dict[str, str] = {
+    **dict.fromkeys(("rag", "knowledge", "document", "documents", "retrieval"), "rag"),
+    **dict.fromkeys(
+        ("classify", "classifies", "classification", "route", "routes", "routing", "pipeline"), "routing"
+    ),
+}
+
+
+def _prompt_text(input: Any) -> str:
+    """Flatten a prompt value / message list into plain text."""
+    if hasattr(input, "to_string"):
+        return input.to_string()
+    return str(input)
+
+
+# Response skeletons matching ClarifiedRequirements / WorkflowArchitecture
+# (tests/integration/test_mock_schema.py validates the mock output against them)
+_REQ_TEMPLATE: Dict[str, Any] = {
+    "business_intent": "",
+    "input_data": {"type": "string", "description": "User input"},
+    "expected_output": {"type": "string", "format": "text"},
+    "business_logic": ["Process user input", "Generate output"],
+    "integrations": [],
+    "performance_requirements": None,
+    "constraints": [],
+    "confidence_score": 0.9,
+}
+_ARCH_TEMPLATE: Dict[str, Any] = {"reasoning": "Mocked architecture"}
+
+
+def _mock_requirements_response(user_content: str) -> Dict[str, Any]:
+    match = _USER_REQ_RE.search(user_content)
+    business_intent = match.group(1) if match and match.group(1) else "process user input"
+
+    return {**_REQ_TEMPLATE, "business_intent": business_intent}
+
+
+def _architecture_branch(user_content: str) -> str:
+    # Classify on the request itself; the system prompt mentions every pattern
+    match = _BUSINESS_INTENT_RE.search(user_content)
+    words = _WORD_RE.findall(match.group(1)) if match else ()
+    hits = {_KEYWORD_TAGS[word] for word in words if word in _KEYWORD_TAGS}
+
+    if "rag" in hits:
+        return "rag"
+    if "routing" in hits:
+        return "routing"
+    return "simple"
+
+
+def _mock_architecture_response(branch: str) -> Dict[str, Any]:
+    if branch == "rag":
+        pattern_id, pattern_name = "rag_pipeline", "RAG Knowledge Retrieval"
+        node_types = ["start", "knowledge-retrieval", "llm", "template-transform", "end"]
+        complexity = "moderate"
+    elif branch == "routing":
+        pattern_id, pattern_name = "classify_and_process", "Classify and Process"
+        node_types = ["start", "question-classifier", "llm", "template-transform", "end"]
+        complexity = "moderate"
+    else:
+        pattern_id, pattern_name = "simple_llm", "Simple LLM Workflow"
+        node_types = ["start", "llm", "end"]
+        complexity = "simple"
+
+    return {
+        **_ARCH_TEMPLATE,
+        "pattern_id": pattern_id,
+        "pattern_name": pattern_name,
+        "node_types": node_types,
+        "edge_structure": [
+            {"from": source, "to": target} for source, target in zip(node_types, node_types[1:])
+        ],
+        "complexity": complexity,
+        "estimated_nodes": len(node_types),
+    }
+
+
+def _configuration_node_types(user_content: str) -> Tuple[str, ...]:
+    match = _NODE_TYPES_RE.search(user_content)
+    return tuple(t.strip() for t in match.group(1).split(",")) if match else ("start", "llm", "end")
+
+
+def _mock_configuration_response(node_types: Tuple[str, ...]) -> Dict[str, Any]:
+    nodes: List[Dict[str, Any]] = []
+    for index, node_type in enumerate(node_types, start=1):
+        data: Dict[str, Any] = {"type": node_type, "title": node_type.replace("-", " ").title()}
+        if node_type == "llm":
+            data["model"] = {"provider": "openai", "name": "gpt-4o-mini", "mode": "chat"}
+        nodes.append({
+            "id": f"{node_type}_{index}",
+            "type": node_type,
+            "data": data,
+            "position": {"x": 100 + 300 * (index - 1), "y": 200},
+        })
+
+    edges = [
+        {"id": f"edge_{index}", "source": source["id"], "target": target["id"]}
+        for index, (source, target) in enumerate(zip(nodes, nodes[1:]), start=1)
+    ]
+    return {"nodes": nodes, "edges": edges}
+
+
+# The quality verdict never varies, so it is validated and serialized once
+_QUALITY_JSON = json.dumps(QualityAssessment(
+    overall_score=95.0,
+    completeness_score=95.0,
+    correctness_score=95.0,
+    best_practices_score=95.0,
+    issues=[],
+    recommendations=["Mocked recommendation"],
+    should_retry=False
+).model_dump())
+
+
+# Serialized responses keyed on the fields they depend on; distinct prompts
+# for the same pattern or node list share one JSON string
+_RESPONSES: Dict[Tuple[str, Any], str] = {}
+
+
+def _serialized(key: Tuple[str, Any], build: Callable[[Any], Dict[str, Any]], arg: Any) -> str:
+    content = _RESPONSES.get(key)
+    if content is None:
+        content = _RESPONSES[key] = json.dumps(build(arg))
+    return content
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_dispatch(user_content: str) -> str:
+    """Serialized response for a lower-cased prompt (the mock is pure, so repeats are cached)."""
+    if "perform comprehensive quality assessment" in user_content:
+        return _QUALITY_JSON
+
+    if "configure all nodes" in user_content:
+        node_types = _configuration_node_types(user_content)
+        return _serialized(("configuration", node_types), _mock_configuration_response, node_types)
+    if "design the optimal workflow architecture" in user_content:
+        branch = _architecture_branch(user_content)
+        return _serialized(("architecture", branch), _mock_architecture_response, branch)
+
+    return json.dumps(_mock_requirements_response(user_content))
+
+
+class MockRunnableLLM(Runnable):
+    """Chat model stand-in that answers each agent prompt with valid JSON."""
+
+    def _dispatch(self, input: Any) -> AIMessage:
+        """Route the prompt to its canned response (pure, no awaits)."""
+        return AIMessage(content=_cached_dispatch(_prompt_text(input).lower()))
+
+    def invoke(self, input: Any, config: Any = None, **kwargs: Any) -> AIMessage:
+        return self._dispatch(input)
+
+    async def ainvoke(self, input: Any, config: Any = None, **kwargs: Any) -> AIMessage:
+        return self._dispatch(input)
+
+
+# The mocks hold no per-test state, so one instance of each serves the session
+_MOCK_LLM = MockRunnableLLM()
+
+
+async def mock_ensure_llm(self) -> MockRunnableLLM:
+    """Replacement for BaseAgent.ensure_llm"""
+    return _MOCK_LLM
+
+
+# OpenAI-style chat completion; plain attributes instead of nested MagicMocks
+_FAKE_COMPLETION = SimpleNamespace(
+    choices=[SimpleNamespace(message=SimpleNamespace(content='{"text": "mocked"}'))]
+)
+
+
+async def mock_generate_completion(*args: Any, **kwargs: Any) -> SimpleNamespace:
+    """Replacement for llm_service.generate_completion"""
+    return _FAKE_COMPLETION
+
+
+async def mock_initialize(*args: Any, **kwargs: Any) -> None:
+    """Replacement for llm_service.initialize: the mocks need no OpenAI client or API key"""
+
+
+async def mock_empty_results(*args: Any, **kwargs: Any) -> List[Any]:
+    """Replacement for pattern recommendation: nothing found"""
+    return []
+
+
+# Shaped like a vector_store.search_patterns hit
+_RAG_PATTERN: Dict[str, Any] = {
+    "id": "rag_pipeline",
+    "content": "Retrieve knowledge-base passages and answer with an LLM",
+    "metadata": {
+        "name": "RAG Knowledge Retrieval",
+        "description": "Answer questions from a knowledge base",
+        "complexity": "moderate",
+        "use_cases": "knowledge base, customer service",
+    },
+    "distance": 0.1,
+}
+
+
+async def mock_search_patterns(query: str = "", *args: Any, **kwargs: Any) -> List[Dict[str, Any]]:
+    """Replacement for vector_store.search_patterns: the RAG pattern for knowledge-base queries"""
+    if any(_KEYWORD_TAGS.get(word) == "rag" for word in _WORD_RE.findall(query.lower())):
+        return [_RAG_PATTERN]
+    return []
+
+
+# (owner, attribute, replacement) triples applied by mock_services_and_llm;
+# owners are resolved at import so the fixture does no dotted-path lookups.
+# Plain coroutines: no test inspects the calls, so AsyncMock bookkeeping is skipped
+_PATCHES = (
+    (llm_service, "initialize", mock_initialize),
+    (llm_service, "generate_completion", mock_generate_completion),
+    (vector_store, "search_patterns", mock_search_patterns),
+    (recommendation_service, "recommend_patterns", mock_empty_results),
+)
+# When recording, or replaying recorded cassettes, the agents talk to the real
+# chat model through the cassette cache (tests/conftest.py) instead of MockRunnableLLM
+if RECORD_MODE != "record" and not REPLAY_AVAILABLE:
+    _PATCHES += ((BaseAgent, "ensure_llm", mock_ensure_llm),)
+
+
+_MISSING = object()
+
+
+# Package scope: patched once for all integration tests, undone before other packages run
+@pytest.fixture(scope="package", autouse=True)
+def mock_services_and_llm():
+    """Run integration tests offline against the mocked LLM and services"""
+    # Snapshot own attributes only, so instance patches are deleted rather than
+    # re-set as stale bound methods on restore
+    originals = [(owner, name, vars(owner).get(name, _MISSING)) for owner, name, _ in _PATCHES]
+    for owner, name, replacement in _PATCHES:
+        setattr(owner, name, replacement)
+    yield
+    for owner, name, original in reversed(originals):
+        if original is _MISSING:
+            delattr(owner, name)
+        else:
+            setattr(owner, name, original)
+
+
+@dataclass(frozen=True, slots=True)
+class WorkflowSummary:
+    """Views of a workflow-graph result, each derived once for repeated assertions"""
+
+    nodes: Tuple[Any, ...]
+    edges: Tuple[Dict[str, Any], ...]
+    node_ids: FrozenSet[str]
+    node_types: FrozenSet[str]
+    final_dsl: Optional[Dict[str, Any]]
+
+    @classmethod
+    def from_result(cls, result: Dict[str, Any]) -> "WorkflowSummary":
+        nodes = tuple(result["configured_nodes"])
+        return cls(
+            nodes=nodes,
+            edges=tuple(result["configured_edges"]),
+            node_ids=frozenset(node.id for node in nodes),
+            node_types=frozenset(node.type for node in nodes),
+            final_dsl=result.get("final_dsl"),
+        )
+
+
+@pytest.fixture(scope="session")
+def make_state():
+    """Factory for a fresh initial workflow-graph state"""
+    def _make_state(
+        user_request: str, complexity: str = "simple", max_iterations: int = 1, **overrides: Any
+    ) -> Dict[str, Any]:
+        state = {
+            "user_request": user_request,
+            "preferences": {"complexity": complexity},
+            "requirements": None,
+            "architecture": None,
+            "configured_nodes": [],
+            "configured_edges": [],
+            "quality_report": None,
+            "final_dsl": None,
+            "iterations": 0,
+            "max_iterations": max_iterations,
+            "current_agent": None,
+            "retrieved_patterns": [],
+            "error_history": [],
+        }
+        state.update(overrides)
+        return state
+
+    return _make_state
+
+
+@pytest.fixture(scope="session", autouse=True)
+def warm_app():
+    """Import the app during session setup so its cost is not billed to the first API test"""
+    get_app()
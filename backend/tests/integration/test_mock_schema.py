@@ -0,0 +1,50 @@
+"""
+Tests for the integration mock LLM
+Guards the hand-built mock responses against agent schema drift
+"""
+
+import json
+
+import pytest
+from app.graph.state import (
+    ClarifiedRequirements,
+    ConfiguredNode,
+    QualityAssessment,
+    WorkflowArchitecture,
+)
+from tests.integration.conftest import _cached_dispatch
+
+
+REQUIREMENTS_PROMPT = "human: user request: build a document q&a bot\n\nsimilar successful workflows:\nnone"
+ARCHITECTURE_PROMPT = (
+    "human: business intent: build a document q&a bot\n\n"
+    "design the optimal workflow architecture in json format."
+)
+CONFIGURATION_PROMPT = (
+    "human: business intent: build a document q&a bot\n\narchitecture design:\n"
+    "- pattern: rag knowledge retrieval\n"
+    "- node types: start, knowledge-retrieval, llm, end\n\n"
+    "configure all nodes with proper settings."
+)
+QUALITY_PROMPT = "human: perform comprehensive quality assessment."
+
+
+@pytest.mark.parametrize("prompt, model", [
+    (REQUIREMENTS_PROMPT, ClarifiedRequirements),
+    (ARCHITECTURE_PROMPT, WorkflowArchitecture),
+    (QUALITY_PROMPT, QualityAssessment),
+], ids=["requirements", "architecture", "quality"])
+def test_mock_responses_match_schema(prompt, model):
+    """Test that each mocked agent response validates against its pydantic model."""
+    model(**json.loads(_cached_dispatch(prompt)))
+
+
+def test_mock_configuration_matches_schema():
+    """Test that mocked nodes validate and edges chain the requested node types."""
+    response = json.loads(_cached_dispatch(CONFIGURATION_PROMPT))
+
+    nodes = [ConfiguredNode(**node) for node in response["nodes"]]
+    assert [node.type for node in nodes] == ["start", "knowledge-retrieval", "llm", "end"]
+    assert [(edge["source"], edge["target"]) for edge in response["edges"]] == [
+        (source.id, target.id) for source, target in zip(nodes, nodes[1:])
+    ]
@@ -3,7 +3,10 @@ Unit Tests for Multi-Agent System
 Tests individual agent functionality
 """
 
+from types import MappingProxyType
+
 import pytest
+from pydantic import ValidationError
 from app.graph.state import (
     WorkflowGenerationState,
     ClarifiedRequirements,
@@ -19,70 +22,55 @@ from app.agents import (
 )
 
 
+# One preferences dict shared by every fixture state
+_PREF_SIMPLE = {"complexity": "simple"}
+
+# Shared read-only base state; fixtures overlay their own keys with {**_BASE_STATE, ...}
+_BASE_STATE = MappingProxyType(WorkflowGenerationState(
+    user_request="Translate text from English to Spanish",
+    preferences=_PREF_SIMPLE,
+    requirements=None,
+    architecture=None,
+    configured_nodes=[],
+    configured_edges=[],
+    quality_report=None,
+    final_dsl=None,
+    iterations=0,
+    max_iterations=3,
+    current_agent=None,
+    retrieved_patterns=[],
+    error_history=[]
+))
+
+# Frozen model, so one instance can back every state; the data is trusted, so skip validation
+_REQUIREMENTS = ClarifiedRequirements.model_construct(
+    business_intent="Translate text from English to Spanish",
+    input_data={"type": "string", "description": "English text"},
+    expected_output={"type": "string", "description": "Spanish translation"},
+    business_logic=["Receive English text", "Translate to Spanish"],
+    integrations=["Translation API"],
+    performance_requirements={},
+    constraints=[],
+    confidence_score=0.9
+)
+
+
 @pytest.fixture
 def simple_state():
     """Create a simple test state."""
-    return {
-        "user_request": "Create a workflow that translates text from English to Spanish",
-        "preferences": {"complexity": "simple"},
-        "requirements": None,
-        "architecture": None,
-        "configured_nodes": [],
-        "configured_edges": [],
-        "quality_report": None,
-        "final_dsl": None,
-        "iterations": 0,
-        "max_iterations": 3,
-        "current_agent": None,
-        "retrieved_patterns": [],
-        "error_history": []
-    }
+    return {**_BASE_STATE, "user_request": "Create a workflow that translates text from English to Spanish"}
 
 
 @pytest.fixture
 def state_with_requirements():
     """Create state with requirements already analyzed."""
-    return {
-        "user_request": "Translate text from English to Spanish",
-        "preferences": {"complexity": "simple"},
-        "requirements": ClarifiedRequirements(
-            business_intent="Translate text from English to Spanish",
-            input_data={"type": "string", "description": "English text"},
-            expected_output={"type": "string", "description": "Spanish translation"},
-            business_logic=["Receive English text", "Translate to Spanish"],
-            integrations=["Translation API"],
-            performance_requirements={},
-            constraints=[],
-            confidence_score=0.9
-        ),
-        "architecture": None,
-        "configured_nodes": [],
-        "configured_edges": [],
-        "quality_report": None,
-        "final_dsl": None,
-        "iterations": 0,
-        "max_iterations": 3,
-        "current_agent": None,
-        "retrieved_patterns": [],
-        "error_history": []
-    }
+    return {**_BASE_STATE, "requirements": _REQUIREMENTS}
 
 
-@pytest.fixture
-def state_with_architecture():
-    """Create state with architecture designed."""
-    requirements = ClarifiedRequirements(
-        business_intent="Translate text from English to Spanish",
-        input_data={"type": "string", "description": "English text"},
-        expected_output={"type": "string", "description": "Spanish translation"},
-        business_logic=["Receive English text", "Translate to Spanish"],
-        integrations=["Translation API"],
-        performance_requirements={},
-        constraints=[],
-        confidence_score=0.9
-    )
-
-    architecture = WorkflowArchitecture(
+def _architecture_state():
+    """Build a state with requirements analyzed and architecture designed."""
+    # Static test data, so model_construct skips re-validating it on every call
+    architecture = WorkflowArchitecture.model_construct(
         pattern_id="pattern_linear_001",
         pattern_name="Linear Processing",
         node_types=["start", "http-request", "end"],
@@ -95,26 +83,31 @@ def state_with_architecture():
         reasoning="Simple linear workflow for translation"
     )
 
-    return {
-        "user_request": "Translate text from English to Spanish",
-        "preferences": {"complexity": "simple"},
-        "requirements": requirements,
-        "architecture": architecture,
-        "configured_nodes": [],
-        "configured_edges": [],
-        "quality_report": None,
-        "final_dsl": None,
-        "iterations": 0,
-        "max_iterations": 3,
-        "current_agent": None,
-        "retrieved_patterns": [],
-        "error_history": []
-    }
+    return {**_BASE_STATE, "requirements": _REQUIREMENTS, "architecture": architecture}
+
+
+@pytest.fixture
+def state_with_architecture():
+    """Create state with architecture designed."""
+    return _architecture_state()
+
+
+@pytest.fixture(scope="module")
+async def configured_state():
+    """Architecture state merged with one ConfigurationAgent run, shared by the module."""
+    state = _architecture_state()
+    state.update(await ConfigurationAgent().execute(state))
+    return state
 
 
 class TestRequirementsAgent:
     """Test Requirements Agent functionality."""
 
+    @pytest.fixture(scope="class")
+    def agent(self):
+        """Share one RequirementsAgent across the methods of this class."""
+        return RequirementsAgent()
+
     @pytest.mark.asyncio
     async def test_agent_initialization(self):
         """Test agent initializes correctly."""
@@ -123,9 +116,9 @@ class TestRequirementsAgent:
         assert agent.llm is None  # Not initialized yet
 
     @pytest.mark.asyncio
-    async def test_requirements_extraction(self, simple_state):
+    @pytest.mark.requires_llm
+    async def test_requirements_extraction(self, agent, simple_state):
         """Test requirements extraction from user request."""
-        agent = RequirementsAgent()
         result = await agent.execute(simple_state)
 
         # Check that requirements were created
@@ -140,13 +133,10 @@ class TestRequirementsAgent:
         assert len(requirements.business_logic) > 0
 
     @pytest.mark.asyncio
-    async def test_fallback_on_error(self, simple_state):
+    async def test_fallback_on_error(self, agent, simple_state):
         """Test that agent has fallback on error."""
-        agent = RequirementsAgent()
-
         # Create invalid state
-        invalid_state = simple_state.copy()
-        invalid_state["user_request"] = ""
+        invalid_state = simple_state | {"user_request": ""}
 
         result = await agent.execute(invalid_state)
 
@@ -158,16 +148,20 @@ class TestRequirementsAgent:
 class TestArchitectureAgent:
     """Test Architecture Agent functionality."""
 
+    @pytest.fixture(scope="class")
+    def agent(self):
+        """Share one ArchitectureAgent across the methods of this class."""
+        return ArchitectureAgent()
+
     @pytest.mark.asyncio
-    async def test_agent_initialization(self):
+    async def test_agent_initialization(self, agent):
         """Test agent initializes correctly."""
-        agent = ArchitectureAgent()
         assert agent.name == "Architecture Agent"
 
     @pytest.mark.asyncio
-    async def test_architecture_design(self, state_with_requirements):
+    @pytest.mark.requires_llm
+    async def test_architecture_design(self, agent, state_with_requirements):
         """Test architecture design from requirements."""
-        agent = ArchitectureAgent()
         result = await agent.execute(state_with_requirements)
 
         # Check that architecture was created
@@ -183,10 +177,8 @@ class TestArchitectureAgent:
         assert architecture.complexity in ["simple", "moderate", "complex"]
 
     @pytest.mark.asyncio
-    async def test_missing_requirements_error(self, simple_state):
+    async def test_missing_requirements_error(self, agent, simple_state):
         """Test that agent requires requirements."""
-        agent = ArchitectureAgent()
-
         with pytest.raises(ValueError, match="Requirements must be analyzed"):
             await agent.execute(simple_state)
 
@@ -194,49 +186,44 @@ class TestArchitectureAgent:
 class TestConfigurationAgent:
     """Test Configuration Agent functionality."""
 
+    @pytest.fixture(scope="class")
+    def agent(self):
+        """Share one ConfigurationAgent across the methods of this class."""
+        return ConfigurationAgent()
+
     @pytest.mark.asyncio
-    async def test_agent_initialization(self):
+    async def test_agent_initialization(self, agent):
         """Test agent initializes correctly."""
-        agent = ConfigurationAgent()
         assert agent.name == "Configuration Agent"
 
     @pytest.mark.asyncio
-    async def test_node_configuration(self, state_with_architecture):
+    @pytest.mark.requires_llm
+    @pytest.mark.slow
+    async def test_node_configuration(self, configured_state):
         """Test node configuration from architecture."""
-        agent = ConfigurationAgent()
-        result = await agent.execute(state_with_architecture)
-
         # Check that nodes were configured
-        assert "configured_nodes" in result
-        assert "configured_edges" in result
+        assert "configured_nodes" in configured_state
+        assert "configured_edges" in configured_state
 
-        nodes = result["configured_nodes"]
-        edges = result["configured_edges"]
+        nodes = configured_state["configured_nodes"]
+        edges = configured_state["configured_edges"]
 
         # Check nodes structure
         assert len(nodes) > 0
-        for node in nodes:
-            assert isinstance(node, ConfiguredNode)
-            assert node.id
-            assert node.type
-            assert node.data
-            assert "title" in node.data
+        assert all(
+            isinstance(node, ConfiguredNode) and node.id and node.type and node.data and "title" in node.data
+            for node in nodes
+        ), nodes
 
         # Check edges structure
         assert len(edges) > 0
-        for edge in edges:
-            assert "id" in edge
-            assert "source" in edge
-            assert "target" in edge
+        assert all({"id", "source", "target"} <= edge.keys() for edge in edges), edges
 
     @pytest.mark.asyncio
-    async def test_fallback_nodes(self, state_with_architecture):
+    async def test_fallback_nodes(self, agent, state_with_architecture):
         """Test that agent creates fallback nodes on error."""
-        agent = ConfigurationAgent()
-
         # Simulate LLM failure by using invalid state
-        invalid_state = state_with_architecture.copy()
-        invalid_state["architecture"] = None
+        invalid_state = state_with_architecture | {"architecture": None}
 
         with pytest.raises(ValueError):
             await agent.execute(invalid_state)
@@ -245,26 +232,23 @@ class TestConfigurationAgent:
 class TestQualityAgent:
     """Test Quality Agent functionality."""
 
+    @pytest.fixture(scope="class")
+    def agent(self):
+        """Share one QualityAgent across the methods of this class."""
+        return QualityAgent()
+
     @pytest.mark.asyncio
-    async def test_agent_initialization(self):
+    async def test_agent_initialization(self, agent):
         """Test agent initializes correctly."""
-        agent = QualityAgent()
         assert agent.name == "Quality Assurance Agent"
 
     @pytest.mark.asyncio
-    async def test_quality_assessment(self, state_with_architecture):
+    @pytest.mark.requires_llm
+    @pytest.mark.slow
+    async def test_quality_assessment(self, agent, configured_state):
         """Test quality assessment of configured workflow."""
-        # First configure the workflow
-        config_agent = ConfigurationAgent()
-        config_result = await config_agent.execute(state_with_architecture)
-
-        # Update state with configured nodes
-        state_with_nodes = state_with_architecture.copy()
-        state_with_nodes.update(config_result)
-
-        # Run quality assessment
-        quality_agent = QualityAgent()
-        result = await quality_agent.execute(state_with_nodes)
+        # Run quality assessment on the already configured workflow
+        result = await agent.execute(configured_state)
 
         # Check quality report
         assert "quality_report" in result
@@ -281,18 +265,12 @@ class TestQualityAgent:
         assert isinstance(report.should_retry, bool)
 
     @pytest.mark.asyncio
-    async def test_quality_scoring_dimensions(self, state_with_architecture):
+    @pytest.mark.requires_llm
+    @pytest.mark.slow
+    async def test_quality_scoring_dimensions(self, agent, configured_state):
         """Test that quality assessment covers all dimensions."""
-        # Configure workflow
-        config_agent = ConfigurationAgent()
-        config_result = await config_agent.execute(state_with_architecture)
-
-        state_with_nodes = state_with_architecture.copy()
-        state_with_nodes.update(config_result)
-
         # Assess quality
-        quality_agent = QualityAgent()
-        result = await quality_agent.execute(state_with_nodes)
+        result = await agent.execute(configured_state)
         report = result["quality_report"]
 
         # Check all quality dimensions are scored
@@ -304,10 +282,35 @@ class TestQualityAgent:
         assert 0 <= report.overall_score <= 100
 
     @pytest.mark.asyncio
-    async def test_requires_complete_workflow(self, simple_state):
+    async def test_requires_complete_workflow(self, agent, simple_state):
         """Test that agent requires complete workflow."""
-        quality_agent = QualityAgent()
-
         # Execute with incomplete state should raise error
         with pytest.raises(ValueError, match="Complete workflow must be generated"):
-            await quality_agent.execute(simple_state)
\ No newline at end of file
+            await agent.execute(simple_state)
+
+
+class TestClarifiedRequirements:
+    """Test ClarifiedRequirements model."""
+
+    def test_requirements_are_immutable(self, state_with_requirements):
+        """Test that analyzed requirements cannot be reassigned."""
+        requirements = state_with_requirements["requirements"]
+
+        with pytest.raises(ValidationError):
+            requirements.business_intent = "Something else"
+
+        updated = requirements.model_copy(update={"confidence_score": 0.5})
+        assert updated.confidence_score == 0.5
+        assert requirements.confidence_score == 0.9
+
+    def test_lowercase_views_follow_copies(self, state_with_requirements):
+        """Test that cached lower-case views are re-derived for updated copies."""
+        requirements = state_with_requirements["requirements"]
+
+        assert requirements.business_intent_lc == "translate text from english to spanish"
+        assert requirements.constraints_lc == ()
+
+        updated = requirements.model_copy(update={"business_intent": "Summarize PDFs", "constraints": ["Use GPT-4"]})
+        assert updated.business_intent_lc == "summarize pdfs"
+        assert updated.constraints_lc == ("use gpt-4",)
+        assert "business_intent_lc" not in updated.model_dump()
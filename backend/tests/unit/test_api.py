@@ -3,37 +3,35 @@ Tests for API endpoints
 """
 
 import pytest
-from fastapi.testclient import TestClient
-from app.main import app
 
-client = TestClient(app)
+from tests.conftest import json_of
 
 
-def test_root_endpoint():
+def test_root_endpoint(client):
     """Test root endpoint returns correct response."""
     response = client.get("/")
     assert response.status_code == 200
-    data = response.json()
+    data = json_of(response)
     assert data["name"] == "DSLMaker v2 API"
     assert data["version"] == "2.0.0-alpha"
     assert data["status"] == "operational"
 
 
-def test_health_endpoint():
+def test_health_endpoint(client):
     """Test health check endpoint."""
     response = client.get("/health")
     assert response.status_code == 200
-    data = response.json()
+    data = json_of(response)
     assert "status" in data
     assert "services" in data
     assert "api" in data["services"]
 
 
-def test_api_info_endpoint():
+def test_api_info_endpoint(client):
     """Test API info endpoint."""
     response = client.get("/api/v1/info")
     assert response.status_code == 200
-    data = response.json()
+    data = json_of(response)
     assert data["version"] == "2.0.0-alpha"
     assert "endpoints" in data
     assert "features" in data
\ No newline at end of file
@@ -6,12 +6,29 @@ import pytest
 from app.services.dsl_service import dsl_service
 from app.models.workflow import WorkflowMetadata
 
+# Validated once; generate_simple_workflow only reads it
+_TEST_METADATA = WorkflowMetadata(
+    name="Test Workflow",
+    description="Test description",
+    complexity="simple"
+)
 
-def test_generate_node_id():
-    """Test node ID generation."""
-    # Reset counter
-    dsl_service._node_counter = 0
 
+@pytest.fixture(scope="module")
+def simple_workflow():
+    """Simple workflow generated once for the read-only validation and export tests"""
+    # generate_simple_workflow resets the node counter itself, so ids do not depend on test order
+    return dsl_service.generate_simple_workflow(description="Test workflow", metadata=_TEST_METADATA)
+
+
+@pytest.fixture
+def fresh_node_counter(monkeypatch):
+    """Start the shared service's node counter at zero, restoring it afterwards"""
+    monkeypatch.setattr(dsl_service, "_node_counter", 0)
+
+
+def test_generate_node_id(fresh_node_counter):
+    """Test node ID generation."""
     node_id_1 = dsl_service.generate_node_id("start")
     assert node_id_1 == "start_1"
 
@@ -63,15 +80,9 @@ def test_create_edge():
 
 def test_generate_simple_workflow():
     """Test simple workflow generation."""
-    metadata = WorkflowMetadata(
-        name="Test Workflow",
-        description="Test description",
-        complexity="simple"
-    )
-
     workflow = dsl_service.generate_simple_workflow(
         description="Test workflow",
-        metadata=metadata
+        metadata=_TEST_METADATA
     )
 
     assert "version" in workflow
@@ -83,98 +94,55 @@ def test_generate_simple_workflow():
     # Check for start, llm, and end nodes
     nodes = workflow["graph"]["nodes"]
     assert len(nodes) == 3
-    node_types = [node["type"] for node in nodes]
-    assert "start" in node_types
-    assert "llm" in node_types
-    assert "end" in node_types
+    node_types = {node["type"] for node in nodes}
+    assert {"start", "llm", "end"} <= node_types
 
 
-def test_validate_workflow_valid():
+def test_validate_workflow_valid(simple_workflow):
     """Test workflow validation with valid workflow."""
-    metadata = WorkflowMetadata(
-        name="Test Workflow",
-        description="Test description",
-        complexity="simple"
-    )
-
-    workflow = dsl_service.generate_simple_workflow(
-        description="Test workflow",
-        metadata=metadata
-    )
-
-    is_valid, errors = dsl_service.validate_workflow(workflow)
+    is_valid, errors = dsl_service.validate_workflow(simple_workflow)
 
     assert is_valid is True
     assert len(errors) == 0
 
 
-def test_validate_workflow_missing_keys():
-    """Test workflow validation with missing keys."""
-    workflow = {
-        "version": "0.1"
-        # Missing metadata and graph
-    }
-
+@pytest.mark.parametrize("workflow, expected_error", [
+    ({"version": "0.1"}, "metadata"),  # Missing metadata and graph
+    (
+        {
+            "version": "0.1",
+            "metadata": {},
+            "graph": {
+                "nodes": [
+                    {"id": "end_1", "type": "end", "data": {}}
+                ],
+                "edges": []
+            }
+        },
+        "start"
+    ),
+], ids=["missing_keys", "missing_start_node"])
+def test_validate_workflow_invalid(workflow, expected_error):
+    """Test workflow validation rejects incomplete workflows with a matching error."""
     is_valid, errors = dsl_service.validate_workflow(workflow)
 
     assert is_valid is False
     assert len(errors) > 0
-    assert any("metadata" in error for error in errors)
-
-
-def test_validate_workflow_missing_start_node():
-    """Test workflow validation with missing start node."""
-    workflow = {
-        "version": "0.1",
-        "metadata": {},
-        "graph": {
-            "nodes": [
-                {"id": "end_1", "type": "end", "data": {}}
-            ],
-            "edges": []
-        }
-    }
-
-    is_valid, errors = dsl_service.validate_workflow(workflow)
-
-    assert is_valid is False
-    assert any("start" in error.lower() for error in errors)
+    assert any(expected_error in error.lower() for error in errors)
 
 
-def test_workflow_to_yaml():
+def test_workflow_to_yaml(simple_workflow):
     """Test workflow to YAML conversion."""
-    metadata = WorkflowMetadata(
-        name="Test Workflow",
-        description="Test description",
-        complexity="simple"
-    )
-
-    workflow = dsl_service.generate_simple_workflow(
-        description="Test workflow",
-        metadata=metadata
-    )
-
-    yaml_str = dsl_service.workflow_to_yaml(workflow)
+    yaml_str = dsl_service.workflow_to_yaml(simple_workflow)
 
     assert isinstance(yaml_str, str)
     assert "version" in yaml_str
     assert "metadata" in yaml_str
 
 
-def test_workflow_to_json():
+def test_workflow_to_json(simple_workflow):
     """Test workflow to JSON conversion."""
-    metadata = WorkflowMetadata(
-        name="Test Workflow",
-        description="Test description",
-        complexity="simple"
-    )
-
-    workflow = dsl_service.generate_simple_workflow(
-        description="Test workflow",
-        metadata=metadata
-    )
-
-    json_str = dsl_service.workflow_to_json(workflow)
+    json_str = dsl_service.workflow_to_json(simple_workflow)
 
     assert isinstance(json_str, str)
     assert '"version"' in json_str
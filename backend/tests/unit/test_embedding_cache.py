@@ -0,0 +1,39 @@
+"""
+Tests for Embedding Cache
+"""
+
+import pytest
+from app.services.embedding_cache import EmbeddingCache
+
+
+@pytest.mark.asyncio
+async def test_get_or_embed_only_embeds_misses(tmp_path):
+    """Test that cached texts are not sent to the embedding function again."""
+    embedded = []
+
+    async def embed(texts):
+        embedded.append(list(texts))
+        return [[float(len(text)), 0.5] for text in texts]
+
+    cache = EmbeddingCache(path=str(tmp_path / "cache.db"), model="test-model")
+    first = await cache.get_or_embed(["a", "bb"], embed)
+    second = await cache.get_or_embed(["bb", "ccc", "a"], embed)
+    cache.close()
+
+    assert first == [[1.0, 0.5], [2.0, 0.5]]
+    assert second == [[2.0, 0.5], [3.0, 0.5], [1.0, 0.5]]
+    assert embedded == [["a", "bb"], ["ccc"]]
+
+
+def test_cache_is_keyed_by_model(tmp_path):
+    """Test that entries persist across instances and are scoped to the model."""
+    path = str(tmp_path / "cache.db")
+
+    cache = EmbeddingCache(path=path, model="model-a")
+    cache.put_many(["hello"], [[0.25, 0.75]])
+    cache.close()
+
+    assert EmbeddingCache(path=path, model="model-a").get_many(["hello", "other"]) == [
+        [0.25, 0.75], None
+    ]
+    assert EmbeddingCache(path=path, model="model-b").get_many(["hello"]) == [None]
@@ -3,26 +3,12 @@ Tests for Generation Endpoints
 """
 
 import pytest
-from fastapi.testclient import TestClient
-from app.main import app
 
-client = TestClient(app)
+from tests.conftest import json_of
 
 
-def test_generate_simple_workflow():
-    """Test simple workflow generation endpoint."""
-    response = client.post(
-        "/api/v1/generate/simple",
-        json={
-            "description": "Create a workflow to summarize text",
-            "preferences": {},
-            "use_rag": False
-        }
-    )
-
-    assert response.status_code == 200
-    data = response.json()
-
+def _check_simple_workflow(data):
+    """Assertions for a plain simple generation."""
     assert "workflow" in data
     assert "metadata" in data
     assert "quality_score" in data
@@ -36,31 +22,56 @@ def test_generate_simple_workflow():
     assert "edges" in workflow["graph"]
 
 
-def test_generate_simple_workflow_validation():
-    """Test that generated workflow is valid."""
-    response = client.post(
-        "/api/v1/generate/simple",
-        json={
-            "description": "Create a simple chatbot",
-            "preferences": {},
-            "use_rag": False
-        }
-    )
-
-    assert response.status_code == 200
-    data = response.json()
+def _check_required_nodes(data):
+    """Assertions that the generated workflow has start and end nodes."""
     workflow = data["workflow"]
 
     # Check for required nodes
     nodes = workflow["graph"]["nodes"]
-    node_types = [node["type"] for node in nodes]
-    assert "start" in node_types
-    assert "end" in node_types
+    node_types = {node["type"] for node in nodes}
+    assert {"start", "end"} <= node_types
+
 
+def _check_full_workflow(data):
+    """Assertions for a full generation."""
+    assert "workflow" in data
+    assert "metadata" in data
+    assert "quality_score" in data
 
-def test_generate_full_workflow_without_rag():
+
+# name -> (endpoint, request body, response check)
+# /generate/simple makes no LLM call, so these run in the default selection
+SIMPLE_CASES = {
+    "simple": (
+        "/api/v1/generate/simple",
+        {"description": "Create a workflow to summarize text", "preferences": {}, "use_rag": False},
+        _check_simple_workflow
+    ),
+    "simple_validation": (
+        "/api/v1/generate/simple",
+        {"description": "Create a simple chatbot", "preferences": {}, "use_rag": False},
+        _check_required_nodes
+    ),
+}
+
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("case", SIMPLE_CASES)
+async def test_generate_simple_workflow(async_client, case):
+    """Test simple workflow generation endpoint."""
+    endpoint, body, check = SIMPLE_CASES[case]
+    response = await async_client.post(endpoint, json=body)
+
+    assert response.status_code == 200
+    check(json_of(response))
+
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.requires_llm
+@pytest.mark.slow
+async def test_generate_full_workflow_without_rag(async_client):
     """Test full workflow generation without RAG."""
-    response = client.post(
+    response = await async_client.post(
         "/api/v1/generate/full",
         json={
             "description": "Create a customer support workflow",
@@ -70,28 +81,26 @@ def test_generate_full_workflow_without_rag():
     )
 
     assert response.status_code == 200
-    data = response.json()
-
-    assert "workflow" in data
-    assert "metadata" in data
-    assert "quality_score" in data
+    _check_full_workflow(json_of(response))
 
 
-def test_get_generation_status():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_get_generation_status(async_client):
     """Test generation status endpoint."""
-    response = client.get("/api/v1/generate/status")
+    response = await async_client.get("/api/v1/generate/status")
 
     assert response.status_code == 200
-    data = response.json()
+    data = json_of(response)
 
     assert "llm_service" in data
     assert "vector_store" in data
     assert "dsl_service" in data
 
 
-def test_generate_simple_workflow_invalid_request():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_generate_simple_workflow_invalid_request(async_client):
     """Test workflow generation with invalid request."""
-    response = client.post(
+    response = await async_client.post(
         "/api/v1/generate/simple",
         json={}  # Missing required fields
     )
@@ -3,14 +3,20 @@ Tests for Pattern Endpoints (Recommendation)
 """
 
 import pytest
-from fastapi.testclient import TestClient
-from app.main import app
 
-client = TestClient(app)
+from tests.conftest import json_of
 
+# These hit the shared Chroma store; keep them on one xdist worker.
+# Recommendations embed the query with OpenAI, hence requires_llm
+pytestmark = pytest.mark.xdist_group("vector_store")
 
-def test_get_pattern_recommendations():
+
+@pytest.mark.requires_llm
+def test_get_pattern_recommendations(client, vector_store_ready):
     """Test pattern recommendation endpoint."""
+    if not vector_store_ready:
+        pytest.skip("Vector store not initialized in test environment")
+
     response = client.get(
         "/api/v1/patterns/recommend",
         params={
@@ -20,14 +26,8 @@ def test_get_pattern_recommendations():
         }
     )
 
-    # May return 503 if vector store not initialized in test environment
-    assert response.status_code in [200, 503]
-
-    if response.status_code == 503:
-        pytest.skip("Vector store not initialized in test environment")
-
     assert response.status_code == 200
-    data = response.json()
+    data = json_of(response)
 
     assert "description" in data
     assert "n_results" in data
@@ -41,8 +41,12 @@ def test_get_pattern_recommendations():
         assert "recommendation_score" in rec
 
 
-def test_get_pattern_recommendations_with_complexity():
+@pytest.mark.requires_llm
+def test_get_pattern_recommendations_with_complexity(client, vector_store_ready):
     """Test recommendations with complexity filter."""
+    if not vector_store_ready:
+        pytest.skip("Vector store not initialized")
+
     response = client.get(
         "/api/v1/patterns/recommend",
         params={
@@ -53,11 +57,8 @@ def test_get_pattern_recommendations_with_complexity():
         }
     )
 
-    if response.status_code == 503:
-        pytest.skip("Vector store not initialized")
-
     assert response.status_code == 200
-    data = response.json()
+    data = json_of(response)
 
     assert "recommendations" in data
 
@@ -66,24 +67,26 @@ def test_get_pattern_recommendations_with_complexity():
         assert rec["metadata"]["complexity"] == "simple"
 
 
-def test_get_pattern_statistics():
+def test_get_pattern_statistics(client, vector_store_ready):
     """Test pattern statistics endpoint."""
-    response = client.get("/api/v1/patterns/statistics")
-
-    # May return 503 if vector store not initialized
-    assert response.status_code in [200, 503]
-
-    if response.status_code == 503:
+    if not vector_store_ready:
         pytest.skip("Vector store not initialized")
 
-    data = response.json()
+    response = client.get("/api/v1/patterns/statistics")
+
+    assert response.status_code == 200
+    data = json_of(response)
 
     # May return error if vector store not initialized
     assert "total_patterns" in data or "error" in data
 
 
-def test_recommend_patterns_invalid_complexity():
+@pytest.mark.requires_llm
+def test_recommend_patterns_invalid_complexity(client, vector_store_ready):
     """Test recommendations with invalid complexity value."""
+    if not vector_store_ready:
+        pytest.skip("Vector store not initialized")
+
     response = client.get(
         "/api/v1/patterns/recommend",
         params={
@@ -93,9 +96,5 @@ def test_recommend_patterns_invalid_complexity():
         }
     )
 
-    # May return 503 if vector store not initialized
-    if response.status_code == 503:
-        pytest.skip("Vector store not initialized")
-
     # Should still work, just won't filter by complexity
     assert response.status_code == 200
\ No newline at end of file
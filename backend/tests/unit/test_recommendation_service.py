@@ -50,8 +50,12 @@ async def test_score_patterns():
 
 
 @pytest.mark.asyncio
-async def test_get_pattern_statistics():
+@pytest.mark.xdist_group("vector_store")
+async def test_get_pattern_statistics(vector_store_ready):
     """Test getting pattern statistics."""
+    if not vector_store_ready:
+        pytest.skip("Vector store not initialized")
+
     stats = await recommendation_service.get_pattern_statistics()
 
     # May return error if vector store not initialized
@@ -0,0 +1,462 @@
+"""
+Tests for retry utilities
+"""
+
+import asyncio
+import time
+
+import pytest
+from app.utils import retry as retry_module
+from app.utils.retry import (
+    retry_with_exponential_backoff,
+    RateLimitError,
+    RetryableError,
+    RetryDecision,
+    AIMDLimiter,
+    CircuitBreaker,
+    CircuitOpenError,
+    TokenBucket,
+    get_circuit_breaker,
+    classify_retry,
+    _apply_jitter,
+    _categorize_error,
+)
+
+
+@pytest.mark.asyncio
+async def test_async_retry_until_success():
+    """Test that async functions are retried until they succeed."""
+    calls = []
+
+    @retry_with_exponential_backoff(max_retries=2, base_delay=0.001)
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise RateLimitError("429 rate limit")
+        return "ok"
+
+    assert asyncio.iscoroutinefunction(flaky)
+    assert await flaky() == "ok"
+    assert len(calls) == 3
+
+
+def test_sync_retry_raises_after_max_retries():
+    """Test that sync functions re-raise once retries are exhausted."""
+    calls = []
+
+    @retry_with_exponential_backoff(max_retries=1, base_delay=0.001)
+    def always_fails():
+        calls.append(1)
+        raise ConnectionError("connection refused")
+
+    assert not asyncio.iscoroutinefunction(always_fails)
+    with pytest.raises(ConnectionError):
+        always_fails()
+    assert len(calls) == 2
+
+
+def test_non_retryable_error_fails_immediately():
+    """Test that non-retryable errors are not retried."""
+    calls = []
+
+    @retry_with_exponential_backoff(max_retries=3, base_delay=0.001)
+    def bad_request():
+        calls.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        bad_request()
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_no_sleep_after_final_attempt(monkeypatch):
+    """Test that the terminal failure re-raises without backing off first."""
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+
+    @retry_with_exponential_backoff(max_retries=2, base_delay=0.001)
+    async def always_fails():
+        raise TimeoutError("timeout")
+
+    with pytest.raises(TimeoutError):
+        await always_fails()
+    assert len(sleeps) == 2
+
+
+@pytest.mark.asyncio
+async def test_backoff_schedule_without_jitter(monkeypatch):
+    """Test that delays follow the capped exponential schedule."""
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+
+    @retry_with_exponential_backoff(
+        max_retries=4, base_delay=1.0, max_delay=5.0, exponential_base=2.0, jitter=False
+    )
+    async def always_fails():
+        raise ConnectionError("connection reset")
+
+    with pytest.raises(ConnectionError):
+        await always_fails()
+    assert sleeps == [1.0, 2.0, 4.0, 5.0]
+
+
+@pytest.mark.asyncio
+async def test_deadline_caps_total_retry_time(monkeypatch):
+    """Test that backoff sleeps are clamped to and stop at the deadline."""
+    now = [0.0]
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+        now[0] += delay
+
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    calls = []
+
+    @retry_with_exponential_backoff(
+        max_retries=10, base_delay=2.0, max_delay=60.0, jitter=False, deadline=5.0
+    )
+    async def always_fails():
+        calls.append(1)
+        raise ConnectionError("connection reset")
+
+    with pytest.raises(ConnectionError):
+        await always_fails()
+    assert sleeps == [2.0, 3.0]
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize("error,decision", [
+    (RetryableError("Error code: 400 - invalid request"), RetryDecision.NO_RETRY),
+    (RetryableError("404 model not found"), RetryDecision.NO_RETRY),
+    (RateLimitError("429 rate limit"), RetryDecision.RETRY_SLOW),
+    (RateLimitError("429 rate limit", retry_after=1.0), RetryDecision.RETRY_FAST),
+    (RetryableError("503 Service Unavailable"), RetryDecision.RETRY_SLOW),
+    (RetryableError("500 Internal Server Error"), RetryDecision.RETRY_FAST),
+    (ConnectionError("connection reset"), RetryDecision.RETRY_FAST),
+    (TimeoutError("read timeout after 400 ms"), RetryDecision.RETRY_FAST),
+    (ConnectionError("proxy: host not found"), RetryDecision.RETRY_FAST),
+])
+def test_classify_retry(error, decision):
+    """Test the default per-exception retry decision."""
+    assert classify_retry(error) == decision
+
+
+@pytest.mark.asyncio
+async def test_classifier_controls_retry(monkeypatch):
+    """Test that NO_RETRY fails immediately and RETRY_SLOW stretches the backoff."""
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    calls = []
+
+    @retry_with_exponential_backoff(max_retries=3, base_delay=1.0, jitter=False)
+    async def bad_request():
+        calls.append(1)
+        raise RetryableError("Error code: 400 - bad request")
+
+    with pytest.raises(RetryableError):
+        await bad_request()
+    assert len(calls) == 1
+    assert sleeps == []
+
+    @retry_with_exponential_backoff(
+        max_retries=2, base_delay=1.0, jitter=False,
+        classifier=lambda error: RetryDecision.RETRY_SLOW
+    )
+    async def overloaded():
+        raise ConnectionError("connection reset")
+
+    with pytest.raises(ConnectionError):
+        await overloaded()
+    assert sleeps == [4.0, 8.0]
+
+
+@pytest.mark.parametrize("jitter_mode,low,high", [
+    ("full", 0.0, 4.0),
+    ("equal", 2.0, 4.0),
+    ("none", 4.0, 4.0),
+])
+def test_apply_jitter_bounds(jitter_mode, low, high):
+    """Test that each jitter mode stays within its window."""
+    for _ in range(100):
+        assert low <= _apply_jitter(4.0, jitter_mode) <= high
+
+
+def test_invalid_jitter_mode():
+    """Test that an unknown jitter mode is rejected at decoration time."""
+    with pytest.raises(ValueError):
+        retry_with_exponential_backoff(jitter_mode="half")
+
+
+@pytest.mark.parametrize("limiter_kwargs", [
+    {"concurrency_limiter": AIMDLimiter()},
+    {"rate_limiter": TokenBucket.per_minute(60)},
+])
+def test_limiters_rejected_for_sync_functions(limiter_kwargs):
+    """Test that async-only limiters are rejected when decorating a sync function."""
+    decorator = retry_with_exponential_backoff(**limiter_kwargs)
+
+    with pytest.raises(ValueError, match="async"):
+        @decorator
+        def complete():
+            return "ok"
+
+
+@pytest.mark.asyncio
+async def test_retry_after_hint_overrides_backoff(monkeypatch):
+    """Test that a Retry-After hint replaces the exponential delay."""
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    calls = []
+
+    @retry_with_exponential_backoff(max_retries=1, base_delay=30.0, max_delay=60.0)
+    async def rate_limited():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RateLimitError("429 rate limit", retry_after=2.0)
+        return "ok"
+
+    assert await rate_limited() == "ok"
+    assert len(sleeps) == 1
+    assert 2.0 <= sleeps[0] <= 2.0 * 1.1
+
+
+def test_circuit_breaker_state_transitions(monkeypatch):
+    """Test CLOSED -> OPEN -> HALF_OPEN -> CLOSED transitions."""
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10.0)
+
+    assert breaker.allow()
+    breaker.on_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.on_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    now[0] += 10.0
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # Only one probe at a time while half-open
+    assert not breaker.allow()
+
+    breaker.on_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast(monkeypatch):
+    """Test that an open breaker rejects calls without invoking the function."""
+    monkeypatch.setattr(retry_module, "_BREAKERS", {})
+    get_circuit_breaker("test-upstream", failure_threshold=1, reset_timeout=60.0)
+    calls = []
+
+    @retry_with_exponential_backoff(max_retries=3, base_delay=0.001, breaker_key="test-upstream")
+    async def unavailable():
+        calls.append(1)
+        raise ConnectionError("connection refused")
+
+    with pytest.raises(CircuitOpenError):
+        await unavailable()
+    with pytest.raises(CircuitOpenError):
+        await unavailable()
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_releases_half_open_slot(monkeypatch):
+    """Test that a half-open probe cancelled mid-call gives its slot back."""
+    monkeypatch.setattr(retry_module, "_BREAKERS", {})
+    breaker = get_circuit_breaker("test-upstream", failure_threshold=1, reset_timeout=0.0)
+    breaker.on_failure()
+    assert breaker.is_open
+    hang = [True]
+
+    @retry_with_exponential_backoff(max_retries=0, breaker_key="test-upstream")
+    async def probe():
+        if hang[0]:
+            await asyncio.Event().wait()
+        return "ok"
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(probe(), timeout=0.01)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker._probes_in_flight == 0
+
+    hang[0] = False
+    assert await probe() == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_aimd_limiter_bounds_concurrency():
+    """Test that the limiter caps in-flight calls and adapts its limit."""
+    limiter = AIMDLimiter(max_concurrency=4, initial_concurrency=2, alpha=1.0, beta=0.5)
+    peak = [0]
+
+    @retry_with_exponential_backoff(max_retries=0, concurrency_limiter=limiter)
+    async def work():
+        peak[0] = max(peak[0], limiter.in_flight)
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    # Starts at 2 slots and grows additively as calls succeed
+    await asyncio.gather(*(work() for _ in range(6)))
+    assert peak[0] <= 4
+    assert limiter.in_flight == 0
+    assert limiter.concurrency == 4
+
+    limiter.on_error()
+    assert limiter.concurrency == 2
+    limiter.on_error()
+    limiter.on_error()
+    assert limiter.concurrency == 1
+
+
+@pytest.mark.asyncio
+async def test_aimd_limiter_cancelled_waiter_passes_wakeup_on():
+    """Test that a waiter cancelled after being woken hands its slot to the next one."""
+    limiter = AIMDLimiter(max_concurrency=1, initial_concurrency=1)
+    await limiter.acquire()
+
+    first = asyncio.create_task(limiter.acquire())
+    second = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    # Wake the first waiter, then cancel it before it gets to run
+    limiter.release()
+    first.cancel()
+    await asyncio.wait_for(second, timeout=1)
+
+    assert first.cancelled()
+    assert limiter.in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_waits_for_refill(monkeypatch):
+    """Test that the bucket sleeps until tokens are available instead of failing."""
+    now = [0.0]
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+        now[0] += delay
+
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+
+    bucket = TokenBucket.per_minute(60)  # 1 token per second, burst of 60
+    bucket.tokens = 1.0
+
+    await bucket.acquire()
+    assert sleeps == []
+    await bucket.acquire()
+    assert sleeps == [pytest.approx(1.0)]
+
+    with pytest.raises(ValueError):
+        await bucket.acquire(cost=61)
+
+
+@pytest.mark.parametrize("error,category", [
+    (RateLimitError("slow down"), "Rate Limit"),
+    (Exception("Error 429: Too Many Requests"), "Rate Limit"),
+    (TimeoutError("rate limit exceeded"), "Rate Limit"),
+    (asyncio.TimeoutError(), "Timeout"),
+    (Exception("connection timeout"), "Timeout"),
+    (ConnectionRefusedError("refused"), "Connection"),
+    (Exception("503 Service Unavailable"), "Service Unavailable"),
+    (Exception("Internal Server Error"), "Server Error"),
+    (Exception("something odd"), "Transient"),
+])
+def test_categorize_error(error, category):
+    """Test error categorization by type and message."""
+    assert _categorize_error(error) == category
+
+
+@pytest.mark.asyncio
+async def test_fallback_model_does_not_mutate_kwargs():
+    """Test that every retry gets the caller's model and only the final attempt falls back."""
+    models = []
+
+    @retry_with_exponential_backoff(max_retries=1, base_delay=0.001, fallback_model="fallback-model")
+    async def complete(model=None):
+        models.append(model)
+        raise RateLimitError("429 rate limit")
+
+    # The fallback fails too, so each call re-raises; the second call must start from the primary again
+    for _ in range(2):
+        with pytest.raises(RateLimitError):
+            await complete(model="primary-model")
+
+    assert models == ["primary-model", "primary-model", "fallback-model"] * 2
+
+
+@pytest.mark.asyncio
+async def test_original_error_raised_when_fallback_fails():
+    """Test that the original error is re-raised if the fallback also fails."""
+
+    @retry_with_exponential_backoff(max_retries=0, fallback_model="fallback-model")
+    async def complete(model=None):
+        if model == "fallback-model":
+            raise ValueError("fallback broken")
+        raise RateLimitError("429 rate limit")
+
+    with pytest.raises(RateLimitError):
+        await complete(model="primary-model")
+
+
+@pytest.mark.asyncio
+async def test_fallback_runs_when_circuit_opens(monkeypatch):
+    """Test that the fallback still runs when the failure opens the breaker, and closes it on success."""
+    monkeypatch.setattr(retry_module, "_BREAKERS", {})
+    breaker = get_circuit_breaker("test-upstream", failure_threshold=1, reset_timeout=60.0)
+
+    @retry_with_exponential_backoff(max_retries=3, fallback_model="fallback-model", breaker_key="test-upstream")
+    async def complete(model=None):
+        if model != "fallback-model":
+            raise ConnectionError("connection refused")
+        return "ok"
+
+    assert await complete(model="primary-model") == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_fallback_goes_through_limiters():
+    """Test that the fallback attempt takes a rate limit token and a concurrency slot."""
+    bucket = TokenBucket(capacity=10, refill_rate=0.001)
+    limiter = AIMDLimiter(max_concurrency=4, initial_concurrency=2, alpha=1.0)
+
+    @retry_with_exponential_backoff(
+        max_retries=0, fallback_model="fallback-model",
+        rate_limiter=bucket, concurrency_limiter=limiter
+    )
+    async def complete(model=None):
+        if model != "fallback-model":
+            raise ConnectionError("connection refused")
+        return "ok"
+
+    assert await complete(model="primary-model") == "ok"
+    assert bucket.tokens == pytest.approx(8, abs=0.01)
+    # Primary failure halved the limit (2 -> 1), the fallback's success added alpha back
+    assert limiter.limit == pytest.approx(2.0)
+    assert limiter.in_flight == 0